@@ -0,0 +1,179 @@
+"""Модуль журнала ответов: запись событий в фоне и подсчёт статистики.
+
+Журнал - файл записей фиксированного размера (RECORD), поле difficulty
+записи - номер сложности в cfg.ANSWER_LOG_DIFFICULTIES. Номера не
+зависят от процесса, поэтому в один журнал могут писать и игра, и
+сервер. Статистика по вопросам:
+    python answer_log.py [путь к журналу]
+"""
+from __future__ import annotations
+
+import queue
+import struct
+import sys
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import config as cfg
+
+# время (unix), сложность, номер вопроса, выбранный вариант, верно ли, задержка (с)
+RECORD = struct.Struct("<dHIBBf")
+
+
+class AnswerLog:
+    """Журнал ответов, который пишет фоновый поток пачками.
+
+    record() только кладёт событие в очередь и не трогает диск. Если
+    журнал не удаётся записать, поток сообщает об ошибке в stderr,
+    сохраняет её в error, и дальше записи отбрасываются.
+    """
+
+    def __init__(
+            self,
+            path: Path,
+            batch_size: int = cfg.ANSWER_LOG_BATCH,
+            flush_interval: float = cfg.ANSWER_LOG_FLUSH_INTERVAL,
+    ) -> None:
+        """Открывает журнал path на дозапись и запускает поток записи."""
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._ids = difficulty_ids()
+        self.error: OSError | None = None
+        self._queue: queue.SimpleQueue[bytes | None] = queue.SimpleQueue()
+        self._thread = threading.Thread(
+            target=self._run, name="answer-log", daemon=True,
+        )
+        self._thread.start()
+
+    def record(
+            self,
+            difficulty: str,
+            question_idx: int,
+            option: int,
+            correct: bool,
+            latency: float,
+    ) -> None:
+        """Ставит ответ в очередь на запись.
+
+        Сложность должна быть в cfg.ANSWER_LOG_DIFFICULTIES, иначе ValueError.
+        """
+        difficulty_id = self._ids.get(difficulty)
+        if difficulty_id is None:
+            raise ValueError(f"Сложности {difficulty!r} нет в журнале ответов")
+        if self.error is not None:
+            return
+        self._queue.put(RECORD.pack(
+            time.time(),
+            difficulty_id,
+            question_idx,
+            option,
+            correct,
+            latency,
+        ))
+
+    def close(self) -> None:
+        """Дописывает очередь и останавливает поток."""
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self) -> None:
+        """Пишет журнал, пока не остановят или не случится ошибка записи."""
+        try:
+            self._write_batches()
+        except OSError as error:
+            self.error = error
+            print(f"Журнал ответов {self.path} не записывается: {error}", file=sys.stderr)
+            # Ждущие записи всё равно не записать: освобождаем очередь
+            while True:
+                try:
+                    self._queue.get_nowait()
+                except queue.Empty:
+                    return
+
+    def _write_batches(self) -> None:
+        """Собирает записи в пачки и пишет их одним вызовом."""
+        # Без буфера пачка уходит одним write() с O_APPEND и не смешивается
+        # с записями другого процесса, пишущего в тот же журнал
+        with self.path.open("ab", buffering=0) as file:
+            batch: list[bytes] = []
+            deadline = time.monotonic() + self.flush_interval
+            running = True
+            while running:
+                timeout = max(0.0, deadline - time.monotonic())
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    item = b""
+                if item is None:
+                    running = False
+                elif item:
+                    batch.append(item)
+                if batch and (
+                    not running
+                    or len(batch) >= self.batch_size
+                    or time.monotonic() >= deadline
+                ):
+                    data = memoryview(b"".join(batch))
+                    while data:
+                        data = data[file.write(data):]
+                    batch.clear()
+                if time.monotonic() >= deadline:
+                    deadline = time.monotonic() + self.flush_interval
+
+
+def difficulty_ids() -> dict[str, int]:
+    """Номера сложностей в записях журнала."""
+    return {name: idx for idx, name in enumerate(cfg.ANSWER_LOG_DIFFICULTIES)}
+
+
+def aggregate(
+        path: Path,
+        chunk_records: int = 65536,
+) -> dict[tuple[str, int], dict[str, float]]:
+    """Точность, средняя задержка и время последнего ответа (unix) по вопросам.
+
+    Ключ - (сложность, номер вопроса). Журнал читается кусками, в
+    памяти - только итоговые суммы.
+    """
+    # (сложность, вопрос) -> [ответов, верных, сумма задержек, последний ответ]
+    totals: defaultdict[tuple[int, int], list[float]] = defaultdict(
+        lambda: [0, 0, 0.0, 0.0],
+    )
+    chunk_size = RECORD.size * chunk_records
+    with path.open("rb") as file:
+        while chunk := file.read(chunk_size):
+            # Недописанная последняя запись пропускается
+            usable = len(chunk) - len(chunk) % RECORD.size
+            for at, difficulty, question_idx, _, correct, latency in RECORD.iter_unpack(
+                chunk[:usable],
+            ):
+                total = totals[difficulty, question_idx]
+                total[0] += 1
+                total[1] += correct
+                total[2] += latency
+                total[3] = max(total[3], at)
+    names = cfg.ANSWER_LOG_DIFFICULTIES
+    result = {}
+    for (difficulty, question_idx), (count, right, latency_sum, last) in sorted(
+        totals.items(),
+    ):
+        name = names[difficulty] if difficulty < len(names) else str(difficulty)
+        result[name, question_idx] = {
+            "answers": count,
+            "accuracy": right / count,
+            "mean_latency": latency_sum / count,
+            "last_answered": last,
+        }
+    return result
+
+
+if __name__ == "__main__":
+    log_path = Path(sys.argv[1]) if len(sys.argv) > 1 else cfg.ANSWER_LOG_PATH
+    for (difficulty, question_idx), row in aggregate(log_path).items():
+        print(
+            f"{difficulty:32} {question_idx:6} ответов {row['answers']:8.0f} "
+            f"верно {row['accuracy']:6.1%} задержка {row['mean_latency']:.2f} с",
+        )
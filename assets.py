@@ -0,0 +1,236 @@
+"""Модуль ресурсов: звуки, изображения и надписи загружаются один раз."""
+from __future__ import annotations
+
+import threading
+import time
+from collections import Counter, OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
+
+import pygame as pg
+
+import config as cfg
+from atlas import Atlas
+
+ImageKey = tuple[str, tuple[int, int]]
+TextKey = tuple[str, str, tuple[int, int, int], bool]
+
+
+class AssetManager:
+    """Общий кэш ресурсов со счётчиками загрузок."""
+
+    def __init__(
+            self,
+            image_budget: int = cfg.IMAGE_CACHE_BUDGET,
+            text_budget: int = cfg.TEXT_CACHE_BUDGET,
+    ) -> None:
+        """Кэш пуст, ресурсы загружаются при первом обращении."""
+        self._sounds: dict[str, pg.mixer.Sound] = {}
+        self._images: OrderedDict[ImageKey, pg.Surface] = OrderedDict()
+        self._pending: dict[ImageKey, Future[pg.Surface]] = {}
+        self._image_exists: dict[str, bool] = {}
+        self.atlas = Atlas()
+        self._button_backgrounds: dict[tuple, pg.Surface] = {}
+        self._executor: ThreadPoolExecutor | None = None
+        self._local = threading.local()
+        self._font_lock = threading.Lock()
+        self.image_budget = image_budget
+        self.image_memory = 0
+        self.evictions = 0
+        self._texts: OrderedDict[TextKey, pg.Surface] = OrderedDict()
+        self.text_budget = text_budget
+        self.text_memory = 0
+        self.text_hits = 0
+        self.text_misses = 0
+        self.load_counts: Counter[str] = Counter()
+        self.load_times: Counter[str] = Counter()
+        self.hits: Counter[str] = Counter()
+
+    def sound(self, name: str) -> pg.mixer.Sound:
+        """Возвращает звук по имени из cfg.SOUND_PATHS."""
+        sound = self._sounds.get(name)
+        if sound is not None:
+            self.hits[name] += 1
+            return sound
+        if not pg.mixer.get_init():
+            pg.mixer.init()
+        start = time.perf_counter()
+        sound = pg.mixer.Sound(cfg.SOUND_PATHS[name])
+        self.load_times[name] += time.perf_counter() - start
+        self.load_counts[name] += 1
+        self._sounds[name] = sound
+        return sound
+
+    def has_image(self, name: str) -> bool:
+        """Есть ли файл изображения в cfg.MEDIA_PATH."""
+        exists = self._image_exists.get(name)
+        if exists is None:
+            exists = self._image_exists[name] = (cfg.MEDIA_PATH / name).is_file()
+        return exists
+
+    def image(self, name: str, size: tuple[int, int]) -> pg.Surface:
+        """Возвращает изображение из cfg.MEDIA_PATH, приведённое к размеру size.
+
+        Поверхности общие для всех спрайтов, изменять их нельзя.
+        """
+        key = (name, size)
+        surface = self.atlas.get(key)
+        if surface is not None:
+            self.hits[name] += 1
+            return surface
+        surface = self._images.get(key)
+        if surface is not None:
+            self._images.move_to_end(key)
+            self.hits[name] += 1
+            return surface
+        pending = self._pending.pop(key, None)
+        if pending is not None:
+            # Файл уже прочитан в фоне, осталось только преобразовать формат
+            surface = pending.result().convert_alpha()
+        else:
+            start = time.perf_counter()
+            surface = _decode_image(name, size).convert_alpha()
+            self.load_times[name] += time.perf_counter() - start
+            self.load_counts[name] += 1
+        packed = self.atlas.add(key, surface)
+        if packed is not None:
+            return packed
+        # Атлас заполнен: храним отдельно, в LRU
+        self._images[key] = surface
+        self.image_memory += _surface_bytes(surface)
+        self._evict_images()
+        return surface
+
+    def button_background(
+            self,
+            size: tuple[int, int],
+            color: tuple[int, int, int],
+    ) -> pg.Surface:
+        """Скруглённый прямоугольник фона кнопки, общий для кнопок одного размера."""
+        key = ("button", size, color)
+        surface = self.atlas.get(key) or self._button_backgrounds.get(key)
+        if surface is not None:
+            return surface
+        surface = self.atlas.reserve(key, size)
+        if surface is None:
+            surface = self._button_backgrounds[key] = pg.Surface(size, pg.SRCALPHA)
+        pg.draw.rect(surface, color, surface.get_rect(), border_radius=6)
+        return surface
+
+    def text(
+            self,
+            string: str,
+            font_name: str,
+            color: tuple[int, int, int],
+            antialias: bool = True,
+    ) -> pg.Surface:
+        """Возвращает надпись, отрисованную шрифтом из cfg.FONT_SIZES.
+
+        Поверхности общие для всех спрайтов, изменять их нельзя.
+        """
+        key = (string, font_name, color, antialias)
+        surface = self._texts.get(key)
+        if surface is not None:
+            self._texts.move_to_end(key)
+            self.text_hits += 1
+            return surface
+        self.text_misses += 1
+        surface = self.thread_font(font_name).render(string, antialias, color)
+        self._texts[key] = surface
+        self.text_memory += _surface_bytes(surface)
+        while self.text_memory > self.text_budget and len(self._texts) > 1:
+            _, old = self._texts.popitem(last=False)
+            self.text_memory -= _surface_bytes(old)
+        return surface
+
+    def prefetch_image(self, name: str, size: tuple[int, int]) -> None:
+        """Начинает читать и масштабировать изображение в фоновом потоке.
+
+        convert_alpha требует дисплея, поэтому выполняется позже в image().
+        """
+        key = (name, size)
+        if key in self._images or key in self._pending or self.atlas.get(key):
+            return
+        self._pending[key] = self.submit(self._timed_decode, name, size)
+
+    def _timed_decode(self, name: str, size: tuple[int, int]) -> pg.Surface:
+        """Читает изображение в фоне, учитывая время загрузки."""
+        start = time.perf_counter()
+        surface = _decode_image(name, size)
+        self.load_times[name] += time.perf_counter() - start
+        self.load_counts[name] += 1
+        return surface
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> Future[Any]:
+        """Выполняет функцию в пуле фоновых потоков."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=cfg.PREFETCH_WORKERS,
+                thread_name_prefix="prefetch",
+            )
+        return self._executor.submit(fn, *args)
+
+    def thread_font(self, name: str) -> pg.font.Font:
+        """Шрифт из cfg.FONT_SIZES, свой для каждого потока.
+
+        Один pg.font.Font нельзя использовать из нескольких потоков сразу.
+        """
+        if threading.current_thread() is threading.main_thread():
+            return getattr(cfg, f"FONT_{name.upper()}")
+        fonts = getattr(self._local, "fonts", None)
+        if fonts is None:
+            fonts = self._local.fonts = {}
+        if name not in fonts:
+            with self._font_lock:
+                fonts[name] = pg.font.Font(None, cfg.FONT_SIZES[name])
+        return fonts[name]
+
+    def _evict_images(self) -> None:
+        """Вытесняет давно не использованные изображения сверх бюджета."""
+        while self.image_memory > self.image_budget and len(self._images) > 1:
+            _, surface = self._images.popitem(last=False)
+            self.image_memory -= _surface_bytes(surface)
+            self.evictions += 1
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        """Загрузки, время загрузки (с) и попадания в кэш по каждому ресурсу."""
+        names = set(self.load_counts) | set(self.hits)
+        return {
+            name: {
+                "loads": self.load_counts[name],
+                "load_time": self.load_times[name],
+                "hits": self.hits[name],
+            }
+            for name in sorted(names)
+        }
+
+    def clear(self) -> None:
+        """Сбрасывает кэш и счётчики."""
+        self._sounds.clear()
+        self._images.clear()
+        self._pending.clear()
+        self._image_exists.clear()
+        self.atlas.clear()
+        self._button_backgrounds.clear()
+        self.image_memory = 0
+        self.evictions = 0
+        self._texts.clear()
+        self.text_memory = 0
+        self.text_hits = 0
+        self.text_misses = 0
+        self.load_counts.clear()
+        self.load_times.clear()
+        self.hits.clear()
+
+
+def _decode_image(name: str, size: tuple[int, int]) -> pg.Surface:
+    """Читает изображение из cfg.MEDIA_PATH и приводит к размеру size."""
+    return pg.transform.scale(pg.image.load(cfg.MEDIA_PATH / name), size)
+
+
+def _surface_bytes(surface: pg.Surface) -> int:
+    """Объём пикселей поверхности в байтах."""
+    return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+
+assets = AssetManager()
@@ -0,0 +1,109 @@
+"""Модуль атласа: мелкие поверхности упаковываются в несколько больших."""
+from __future__ import annotations
+
+from collections.abc import Hashable
+
+import pygame as pg
+
+import config as cfg
+
+
+class AtlasPage:
+    """Страница атласа, заполняемая полками слева направо, сверху вниз."""
+
+    def __init__(self, size: tuple[int, int]) -> None:
+        """Пустая прозрачная страница."""
+        self.surface = pg.Surface(size, pg.SRCALPHA).convert_alpha()
+        self.surface.fill((0, 0, 0, 0))
+        # Полки: [y, высота, занятая ширина]
+        self.shelves: list[list[int]] = []
+        self.free_y = 0
+        # Сколько областей выдано; по нему видно, что страница изменилась
+        self.placed = 0
+
+    def place(self, size: tuple[int, int]) -> pg.Rect | None:
+        """Находит место под прямоугольник size или возвращает None."""
+        width, height = size
+        page_width, page_height = self.surface.get_size()
+        if width > page_width:
+            return None
+        for shelf in self.shelves:
+            y, shelf_height, used = shelf
+            # На полку ставим только близкие по высоте, чтобы не терять место
+            if height <= shelf_height <= height * 2 and used + width <= page_width:
+                shelf[2] += width
+                self.placed += 1
+                return pg.Rect(used, y, width, height)
+        if self.free_y + height > page_height:
+            return None
+        self.shelves.append([self.free_y, height, width])
+        rect = pg.Rect(0, self.free_y, width, height)
+        self.free_y += height
+        self.placed += 1
+        return rect
+
+
+class Atlas:
+    """Атлас поверхностей: спрайты получают подповерхности его страниц.
+
+    Места не освобождаются, поэтому число страниц ограничено; когда
+    места нет, add() возвращает None и вызывающий хранит поверхность сам.
+    """
+
+    def __init__(
+            self,
+            page_size: int = cfg.ATLAS_PAGE_SIZE,
+            max_pages: int = cfg.ATLAS_MAX_PAGES,
+    ) -> None:
+        """Атлас без страниц."""
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.pages: list[AtlasPage] = []
+        self._regions: dict[Hashable, pg.Surface] = {}
+
+    def get(self, key: Hashable) -> pg.Surface | None:
+        """Область атласа, сохранённая под ключом key."""
+        return self._regions.get(key)
+
+    def reserve(self, key: Hashable, size: tuple[int, int]) -> pg.Surface | None:
+        """Выделяет прозрачную область size под ключом key."""
+        region = self._regions.get(key)
+        if region is not None:
+            return region
+        for page in self.pages:
+            rect = page.place(size)
+            if rect is not None:
+                break
+        else:
+            if len(self.pages) >= self.max_pages:
+                return None
+            # Слишком большой элемент получает свою страницу по размеру
+            page = AtlasPage((
+                max(self.page_size, size[0]),
+                max(self.page_size, size[1]),
+            ))
+            self.pages.append(page)
+            rect = page.place(size)
+        region = self._regions[key] = page.surface.subsurface(rect)
+        return region
+
+    def add(self, key: Hashable, surface: pg.Surface) -> pg.Surface | None:
+        """Копирует surface в атлас и возвращает область с ней."""
+        region = self.reserve(key, surface.get_size())
+        if region is not None:
+            # MAX поверх прозрачной области копирует пиксели вместе с альфой
+            region.blit(surface, (0, 0), special_flags=pg.BLEND_RGBA_MAX)
+        return region
+
+    def memory(self) -> int:
+        """Объём страниц в байтах."""
+        total = 0
+        for page in self.pages:
+            width, height = page.surface.get_size()
+            total += width * height * page.surface.get_bytesize()
+        return total
+
+    def clear(self) -> None:
+        """Удаляет все страницы."""
+        self.pages.clear()
+        self._regions.clear()
@@ -0,0 +1,147 @@
+"""Модуль звука: пул каналов для эффектов и музыка сцен со сменой в фоне.
+
+Эффекты играют на зарезервированных каналах, поэтому частые клики не
+обрывают друг друга случайным образом, а звуки загружаются один раз
+(assets.sound). Смену музыки ведёт отдельный поток: затухание, чтение
+файла и нарастание не задерживают кадры.
+"""
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from collections import deque
+from pathlib import Path
+
+import pygame as pg
+
+import config as cfg
+from assets import assets
+
+
+class AudioSystem:
+    """Эффекты, музыка и замеры задержки от ввода до звука."""
+
+    def __init__(self, ui_channels: int = cfg.AUDIO_UI_CHANNELS) -> None:
+        """Звук выключен до start(), музыка только запоминается."""
+        self.ui_channels = ui_channels
+        self._pool: list[pg.mixer.Channel] = []
+        # Когда начал играть каждый канал пула, чтобы занять самый старый
+        self._started: list[float] = []
+        self._music: Path | None = None
+        self._commands: queue.Queue[tuple[Path | None, int] | None] = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._input_at: float | None = None
+        # До выхода из колонок звук ещё проходит буфер микшера, с
+        self._buffer_latency = 0.0
+        self.latencies: deque[float] = deque(maxlen=cfg.PROFILER_WINDOW)
+
+    @staticmethod
+    def pre_init() -> None:
+        """Задаёт параметры микшера; вызывается до pg.init()."""
+        pg.mixer.pre_init(frequency=cfg.AUDIO_FREQUENCY, buffer=cfg.AUDIO_BUFFER)
+
+    @property
+    def started(self) -> bool:
+        """Запущен ли звук."""
+        return self._thread is not None
+
+    def start(self, preload: tuple[str, ...] = tuple(cfg.SOUND_PATHS)) -> None:
+        """Резервирует каналы, загружает звуки preload и включает музыку."""
+        if not pg.mixer.get_init():
+            pg.mixer.init()
+        if pg.mixer.get_num_channels() < self.ui_channels * 2:
+            pg.mixer.set_num_channels(self.ui_channels * 2)
+        pg.mixer.set_reserved(self.ui_channels)
+        self._pool = [pg.mixer.Channel(i) for i in range(self.ui_channels)]
+        self._started = [0.0] * self.ui_channels
+        frequency, _, _ = pg.mixer.get_init()
+        self._buffer_latency = cfg.AUDIO_BUFFER / frequency
+        for name in preload:
+            assets.sound(name).set_volume(cfg.EFFECTS_VOLUME)
+        self._thread = threading.Thread(target=self._run, name="music", daemon=True)
+        self._thread.start()
+        if self._music is not None:
+            self._commands.put((self._music, 0))
+
+    def mark_input(self) -> None:
+        """Запоминает время последнего ввода, от него считается задержка звука."""
+        self._input_at = time.perf_counter()
+
+    def play(self, name: str) -> None:
+        """Играет эффект на свободном канале пула или на самом старом."""
+        if not self._pool:
+            # Звук ещё не запущен: эффекты до start() не нужны
+            return
+        sound = assets.sound(name)
+        idx = next(
+            (i for i, channel in enumerate(self._pool) if not channel.get_busy()),
+            None,
+        )
+        if idx is None:
+            idx = min(range(len(self._pool)), key=lambda i: self._started[i])
+        self._pool[idx].play(sound)
+        now = time.perf_counter()
+        self._started[idx] = now
+        if self._input_at is not None:
+            latency = now - self._input_at + self._buffer_latency
+            self.latencies.append(latency * 1000)
+            self._input_at = None
+
+    def play_music(self, path: Path | None, fade_ms: int = cfg.MUSIC_FADE_MS) -> None:
+        """Плавно переключает музыку на path; None - тишина."""
+        if path == self._music:
+            return
+        self._music = path
+        if self.started:
+            self._commands.put((path, fade_ms))
+
+    def latency_stats(self) -> dict[str, float]:
+        """Задержка от ввода до звука в мс: средняя, p95 и максимальная."""
+        ordered = sorted(self.latencies)
+        if not ordered:
+            return {"mean": 0.0, "p95": 0.0, "max": 0.0}
+        return {
+            "mean": sum(ordered) / len(ordered),
+            "p95": ordered[round((len(ordered) - 1) * 0.95)],
+            "max": ordered[-1],
+        }
+
+    def stop(self) -> None:
+        """Останавливает музыку и поток смены музыки."""
+        if self._thread is not None:
+            self._commands.put(None)
+            self._thread.join()
+            self._thread = None
+        if pg.mixer.get_init():
+            pg.mixer.music.stop()
+        self._pool = []
+
+    def _run(self) -> None:
+        """Меняет музыку по командам, не блокируя главный поток."""
+        playing: Path | None = None
+        while True:
+            command = self._commands.get()
+            if command is None:
+                return
+            # Из нескольких ждущих смен важна только последняя
+            while not self._commands.empty():
+                newer = self._commands.get()
+                if newer is None:
+                    return
+                command = newer
+            path, fade_ms = command
+            if path == playing:
+                continue
+            if playing is not None and fade_ms:
+                pg.mixer.music.fadeout(fade_ms)
+                time.sleep(fade_ms / 1000)
+            pg.mixer.music.stop()
+            playing = path
+            if path is not None:
+                pg.mixer.music.load(path)
+                pg.mixer.music.set_volume(cfg.MUSIC_VOLUME)
+                pg.mixer.music.play(loops=-1, fade_ms=fade_ms)
+
+
+audio = AudioSystem()
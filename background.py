@@ -0,0 +1,68 @@
+"""Модуль фона: подготовка фона под размер экрана с кэшем на диске."""
+from __future__ import annotations
+
+from pathlib import Path
+
+import pygame as pg
+
+import cache_files
+import config as cfg
+
+
+def prepare_background(size: tuple[int, int]) -> pg.Surface:
+    """Фон размером size: из кэша на диске или из cfg.BACKGROUND_PATH.
+
+    Можно вызывать из фонового потока; convert() делает вызывающий.
+    """
+    cache_path = _cache_path(size)
+    if cache_path.is_file():
+        try:
+            return pg.image.load(cache_path)
+        except pg.error:
+            # Битый файл кэша: подготовим фон заново
+            pass
+    surface = fit_background(pg.image.load(cfg.BACKGROUND_PATH), size)
+    _store(surface, size)
+    return surface
+
+
+def fit_background(image: pg.Surface, size: tuple[int, int]) -> pg.Surface:
+    """Вырезает из центра image область size.
+
+    Изображение меньше экрана сначала увеличивается с сохранением
+    пропорций так, чтобы закрыть экран целиком.
+    """
+    width, height = size
+    scale = max(1.0, width / image.get_width(), height / image.get_height())
+    if scale > 1.0:
+        scaled_size = (
+            max(width, round(image.get_width() * scale)),
+            max(height, round(image.get_height() * scale)),
+        )
+        image = pg.transform.smoothscale(image, scaled_size)
+    crop_rect = pg.Rect(
+        (image.get_width() - width) // 2,
+        (image.get_height() - height) // 2,
+        width,
+        height,
+    )
+    # copy(), чтобы не держать в памяти всё исходное изображение
+    return image.subsurface(crop_rect).copy()
+
+
+def _cache_path(size: tuple[int, int]) -> Path:
+    """Файл кэша для size; в имени - размер и дата изменения исходника."""
+    stat = cfg.BACKGROUND_PATH.stat()
+    width, height = size
+    name = f"background_{width}x{height}_{stat.st_mtime_ns}_{stat.st_size}.bmp"
+    return cfg.CACHE_PATH / name
+
+
+def _store(surface: pg.Surface, size: tuple[int, int]) -> None:
+    """Сохраняет фон в кэш, убирая устаревшие файлы того же размера."""
+    width, height = size
+    cache_files.store(
+        _cache_path(size),
+        f"background_{width}x{height}_*.bmp",
+        lambda tmp_path: pg.image.save(surface, tmp_path),
+    )
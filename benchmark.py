@@ -0,0 +1,336 @@
+"""Модуль замеров производительности без окна и звука.
+
+Проходит викторины easy/medium/hard и синтетические банки, замеряя
+время этапов построения сцены, разметки и отрисовки, кадры в секунду
+и выделения памяти. Запуск:
+    python benchmark.py [--size 1920x1080] [--synthetic 200 2000] [--repeat 3]
+                        [--save-baseline] [--compare] [--threshold 0.2]
+                        [--alloc-threshold 0.2]
+    python benchmark.py --size 3840x2160 --backends surface texture
+    python benchmark.py --memory 100000
+"""
+from __future__ import annotations
+
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import json
+import random
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from collections.abc import Sequence
+from functools import wraps
+from pathlib import Path
+from typing import Any, Callable
+
+import pygame as pg
+
+import config as cfg
+import main
+import quiz
+from assets import assets
+from audio import audio
+from layout import TextLayout, layout
+from question_bank import source_banks
+from question_layout import question_layouts
+from question_model import ColumnarBank, Question
+
+BASELINE_PATH = cfg.base_path / "benchmark_baseline.json"
+# Этапы быстрее этого не сравниваются с базовыми значениями - там один шум
+NOISE_MS = 2.0
+# Выделения памяти меньше этого тоже не сравниваются, КБ
+NOISE_KB = 16.0
+
+# Замеряемые этапы: имя -> (класс, метод)
+STAGES: dict[str, tuple[type, str]] = {
+    "make_widjets": (quiz.Quiz, "make_widjets"),
+    "wrap": (TextLayout, "wrap"),
+    "button_surface": (quiz.Button, "_create_button_surface"),
+    "image_load": (quiz.Image, "_render"),
+    "render": (main.App, "render"),
+}
+
+
+class StageTimer:
+    """Подменяет методы этапов обёртками, суммирующими время вызовов."""
+
+    def __init__(self) -> None:
+        """Пустые счётчики."""
+        self.totals: defaultdict[str, float] = defaultdict(float)
+        self.calls: defaultdict[str, int] = defaultdict(int)
+        self._originals: list[tuple[type, str, Callable]] = []
+
+    def install(self) -> None:
+        """Оборачивает методы из STAGES."""
+        for stage, (cls, attr) in STAGES.items():
+            original = getattr(cls, attr)
+            self._originals.append((cls, attr, original))
+            setattr(cls, attr, self._wrap(stage, original))
+
+    def uninstall(self) -> None:
+        """Возвращает исходные методы."""
+        for cls, attr, original in reversed(self._originals):
+            setattr(cls, attr, original)
+        self._originals.clear()
+
+    def reset(self) -> None:
+        """Обнуляет счётчики."""
+        self.totals.clear()
+        self.calls.clear()
+
+    def _wrap(self, stage: str, fn: Callable) -> Callable:
+        """Обёртка, замеряющая время fn."""
+        @wraps(fn)
+        def timed(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.totals[stage] += time.perf_counter() - start
+                self.calls[stage] += 1
+        return timed
+
+
+def synthetic_bank(size: int, seed: int = 0) -> list[dict]:
+    """Банк из size вопросов, собранных из слов настоящих вопросов."""
+    rng = random.Random(seed)
+    source = [q for bank in source_banks().values() for q in bank]
+    words = [word for q in source for word in q["text"].split()]
+    options = [option for q in source for option in q["options"]]
+    images = sorted(
+        path.name
+        for path in cfg.MEDIA_PATH.glob("*.jpg")
+        if path.name != "background.jpg"
+    )
+    return [
+        {
+            "text": " ".join(rng.choices(words, k=rng.randint(6, 24))) + "?",
+            "options": rng.sample(options, 4),
+            "answer_idx": rng.randrange(4),
+            "image_name": rng.choice(images),
+        }
+        for _ in range(size)
+    ]
+
+
+def play(app: main.App, name: str, rng: random.Random) -> tuple[int, float]:
+    """Проходит викторину name случайными ответами, возвращает кадры и время."""
+    app.start_quiz(name)
+    app.render()
+    frames = 1
+    start = time.perf_counter()
+    while app.scene is not app.scenes.get("menu"):
+        buttons = [s for s in app.scene.sprites if isinstance(s, quiz.Button)]
+        pos = rng.choice(buttons).rect.center
+        app.scene.handle_events([pg.event.Event(pg.MOUSEBUTTONDOWN, button=1, pos=pos)])
+        app.update()
+        app.render()
+        frames += 1
+    return frames, time.perf_counter() - start
+
+
+def run(
+        size: tuple[int, int],
+        synthetic: Sequence[int],
+        repeat: int = 3,
+        backend: str = "surface",
+) -> dict[str, dict[str, float]]:
+    """Замеры для всех банков при отрисовке способом backend.
+
+    Ключ результата - "банк/cold" или "банк/warm", для текстур - с
+    приставкой "texture:". Каждый замер повторяется repeat раз,
+    берётся лучшее время.
+    """
+    cfg.SCREEN_SIZE = size
+    cfg.ANSWER_LOG_ENABLED = False
+    cfg.ADAPTIVE_ENABLED = False
+    # Прошлый прогон мог оставить поверхности и разметку другого окна
+    assets.clear()
+    layout.clear()
+    question_layouts.clear()
+    prefix = "" if backend == "surface" else f"{backend}:"
+    app = main.App(backend=backend)
+    app.finish_startup()
+    banks = dict(app.banks)
+    for count in synthetic:
+        name = f"synthetic-{count}"
+        banks[name] = synthetic_bank(count)
+        app.add_difficulty(name, banks[name])
+    if cfg.PRECOMPILE_LAYOUTS:
+        # Разметка, как при запуске игры, но сразу и без файла на диске
+        question_layouts.compile(banks, size, use_disk=False)
+    timer = StageTimer()
+    timer.install()
+    results = {}
+    try:
+        for name in app.difficulties:
+            for mode in ("cold", "warm"):
+                runs = []
+                for _ in range(repeat):
+                    if mode == "cold":
+                        assets.clear()
+                        layout.clear()
+                    timer.reset()
+                    frames, elapsed = play(app, name, random.Random(0))
+                    metrics = {"frames": frames, "frame_ms": elapsed / frames * 1000}
+                    for stage in STAGES:
+                        metrics[f"{stage}_ms"] = timer.totals[stage] * 1000
+                        metrics[f"{stage}_calls"] = timer.calls[stage]
+                    runs.append(metrics)
+                best = {metric: min(run[metric] for run in runs) for metric in runs[0]}
+                best["fps"] = 1000 / best["frame_ms"] if best["frame_ms"] else 0.0
+                results[f"{prefix}{name}/{mode}"] = best
+    finally:
+        timer.uninstall()
+
+    # Память замеряется отдельным проходом: tracemalloc искажает время
+    for name in app.difficulties:
+        tracemalloc.start()
+        play(app, name, random.Random(0))
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results[f"{prefix}{name}/warm"]["alloc_kb"] = current / 1024
+        results[f"{prefix}{name}/warm"]["alloc_peak_kb"] = peak / 1024
+    audio.stop()
+    return results
+
+
+def memory_formats(count: int) -> dict[str, dict[str, float]]:
+    """Память и время доступа банка из count вопросов в разных форматах.
+
+    Вопросы читаются из JSON, как из файла, поэтому у каждого формата
+    свои строки, а не общие с генератором.
+    """
+    data = json.dumps(synthetic_bank(count), ensure_ascii=False)
+    formats: dict[str, Callable[[], Sequence[Any]]] = {
+        "dict": lambda: json.loads(data),
+        "Question": lambda: [Question.from_mapping(q) for q in json.loads(data)],
+        "ColumnarBank": lambda: ColumnarBank(json.loads(data)),
+    }
+    rng = random.Random(0)
+    indices = [rng.randrange(count) for _ in range(10000)]
+    results = {}
+    for name, build in formats.items():
+        tracemalloc.start()
+        bank = build()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        start = time.perf_counter()
+        for idx in indices:
+            question = bank[idx]
+            question["text"], question["options"], question.get("image_name")
+        elapsed = time.perf_counter() - start
+        results[name] = {
+            "memory_kb": current / 1024,
+            "peak_kb": peak / 1024,
+            "access_us": elapsed / len(indices) * 1e6,
+        }
+        del bank
+    return results
+
+
+def print_memory_report(count: int, results: dict[str, dict[str, float]]) -> None:
+    """Печатает сравнение форматов вопросов."""
+    print(f"Банк из {count} вопросов")
+    print(f"{'':14}{'память, КБ':>14}{'пик, КБ':>14}{'доступ, мкс':>14}")
+    for name, metrics in results.items():
+        print(
+            f"{name:14}{metrics['memory_kb']:>14.0f}{metrics['peak_kb']:>14.0f}"
+            f"{metrics['access_us']:>14.2f}",
+        )
+
+
+def compare(
+        results: dict[str, dict[str, float]],
+        baseline: dict[str, dict[str, float]],
+        threshold: float,
+        alloc_threshold: float,
+) -> list[str]:
+    """Ухудшения относительно baseline.
+
+    Время этапов (*_ms) сравнивается с порогом threshold, выделения
+    памяти (*_kb) - с порогом alloc_threshold. FPS следует из frame_ms.
+    """
+    regressions = []
+    for key, metrics in results.items():
+        for metric, value in metrics.items():
+            if metric.endswith("_ms"):
+                limit, noise, unit = threshold, NOISE_MS, "мс"
+            elif metric.endswith("_kb"):
+                limit, noise, unit = alloc_threshold, NOISE_KB, "КБ"
+            else:
+                continue
+            old = baseline.get(key, {}).get(metric)
+            if old and old > noise and value > old * (1 + limit):
+                regressions.append(f"{key} {metric}: {old:.2f} -> {value:.2f} {unit}")
+    return regressions
+
+
+def print_report(results: dict[str, dict[str, float]]) -> None:
+    """Печатает результаты таблицей."""
+    columns = ["frames", "fps", "frame_ms", *(f"{stage}_ms" for stage in STAGES)]
+    width = max(len(key) for key in results) + 2
+    print(" " * width + "".join(f"{column:>18}" for column in columns))
+    for key, metrics in results.items():
+        row = "".join(f"{metrics[column]:>18.2f}" for column in columns)
+        print(f"{key:{width}}{row}")
+    for key, metrics in results.items():
+        if "alloc_peak_kb" in metrics:
+            print(f"{key:{width}}пик памяти {metrics['alloc_peak_kb']:.0f} КБ")
+
+
+def main_cli(argv: list[str] | None = None) -> int:
+    """Точка входа."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", default="1920x1080", help="размер экрана, ШxВ")
+    parser.add_argument(
+        "--synthetic", type=int, nargs="*", default=[200, 2000],
+        help="размеры синтетических банков",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="повторов каждого замера")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--compare", action="store_true")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    parser.add_argument("--alloc-threshold", type=float, default=0.2)
+    parser.add_argument(
+        "--backends", nargs="+", default=["surface"], choices=["surface", "texture"],
+        help="способы отрисовки для сравнения",
+    )
+    parser.add_argument(
+        "--memory", type=int, metavar="N",
+        help="только сравнить память форматов вопросов на банке из N вопросов",
+    )
+    args = parser.parse_args(argv)
+
+    if args.memory:
+        print_memory_report(args.memory, memory_formats(args.memory))
+        return 0
+
+    width, height = (int(side) for side in args.size.split("x"))
+    results = {}
+    for backend in args.backends:
+        results.update(run((width, height), args.synthetic, args.repeat, backend))
+    # pg.quit() только в конце: шрифты cfg после него не пересоздаются
+    pg.quit()
+    print_report(results)
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"Базовые значения записаны в {args.baseline}")
+    if args.compare:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        regressions = compare(results, baseline, args.threshold, args.alloc_threshold)
+        for line in regressions:
+            print("Ухудшение:", line)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
@@ -0,0 +1,28 @@
+"""Модуль файлов кэша: атомарная запись с удалением устаревших версий."""
+from __future__ import annotations
+
+import os
+from collections.abc import Callable
+from pathlib import Path
+
+
+def store(cache_path: Path, stale_pattern: str, write: Callable[[Path], None]) -> None:
+    """Записывает файл кэша cache_path функцией write(путь).
+
+    Сначала удаляет в той же папке файлы по шаблону stale_pattern, затем
+    write пишет во временный файл с тем же расширением, и он подменяет
+    cache_path. Ошибки диска не поднимаются: без кэша всё работает, только
+    медленнее при следующем запуске.
+    """
+    folder = cache_path.parent
+    try:
+        folder.mkdir(parents=True, exist_ok=True)
+        for old in folder.glob(stale_pattern):
+            old.unlink(missing_ok=True)
+        tmp_path = cache_path.with_name(
+            f".{cache_path.stem}.{os.getpid()}{cache_path.suffix}",
+        )
+        write(tmp_path)
+        tmp_path.replace(cache_path)
+    except OSError:
+        pass
@@ -0,0 +1,114 @@
+"""Модуль кликов: поиск кнопки под курсором по сетке и фокус с клавиатуры."""
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import Protocol
+
+import pygame as pg
+
+import config as cfg
+
+
+class Clickable(Protocol):
+    """То, что слой кликов ожидает от кнопки."""
+
+    rect: pg.Rect
+
+    def on_click(self) -> None:
+        """Действие на нажатие."""
+
+    def set_highlight(self, highlighted: bool) -> None:
+        """Включает или выключает подсветку."""
+
+
+class ClickLayer:
+    """Кнопки сцены, разложенные по ячейкам сетки.
+
+    Клик проверяет только кнопки своей ячейки и срабатывает на одной,
+    верхней из них. Наведение и фокус обрабатываются по событиям,
+    без обхода кнопок каждый кадр.
+    """
+
+    def __init__(self, cell_size: int = cfg.CLICK_GRID_CELL) -> None:
+        """Пустой слой."""
+        self.cell_size = cell_size
+        self._cells: dict[tuple[int, int], list[tuple[int, Clickable]]] = {}
+        self._order: list[Clickable] = []
+        self.hovered: Clickable | None = None
+        self.focused: Clickable | None = None
+
+    def rebuild(self, buttons: Iterable[Clickable]) -> None:
+        """Заново раскладывает кнопки; последние рисуются поверх первых."""
+        # Кнопки могут остаться на экране с новым текстом: снимаем подсветку
+        self.clear_highlight()
+        self._cells.clear()
+        self._order = []
+        for z, button in enumerate(buttons):
+            self._order.append(button)
+            rect = button.rect
+            left, top = rect.left // self.cell_size, rect.top // self.cell_size
+            right = (rect.right - 1) // self.cell_size
+            bottom = (rect.bottom - 1) // self.cell_size
+            for cx in range(left, right + 1):
+                for cy in range(top, bottom + 1):
+                    self._cells.setdefault((cx, cy), []).append((z, button))
+        # Порядок обхода с клавиатуры: сверху вниз, слева направо
+        self._order.sort(key=lambda button: (button.rect.top, button.rect.left))
+
+    def at(self, pos: tuple[int, int]) -> Clickable | None:
+        """Верхняя кнопка в точке pos."""
+        cell = (pos[0] // self.cell_size, pos[1] // self.cell_size)
+        hit = None
+        hit_z = -1
+        for z, button in self._cells.get(cell, ()):
+            if z > hit_z and button.rect.collidepoint(pos):
+                hit, hit_z = button, z
+        return hit
+
+    def handle_event(self, event: pg.event.Event) -> bool:
+        """Реакция на событие, возвращает True, если оно обработано."""
+        if event.type == pg.MOUSEBUTTONDOWN and event.button == 1:
+            button = self.at(event.pos)
+            if button is not None:
+                button.on_click()
+                return True
+        elif event.type == pg.MOUSEMOTION:
+            self._set_hovered(self.at(event.pos))
+        elif event.type == pg.KEYDOWN:
+            if event.key == pg.K_TAB:
+                self._move_focus(-1 if event.mod & pg.KMOD_SHIFT else 1)
+                return True
+            if event.key in (pg.K_RETURN, pg.K_KP_ENTER, pg.K_SPACE) and self.focused:
+                self.focused.on_click()
+                return True
+        return False
+
+    def clear_highlight(self) -> None:
+        """Снимает подсветку и забывает наведённую и выбранную кнопки."""
+        for button in (self.hovered, self.focused):
+            if button is not None:
+                button.set_highlight(False)
+        self.hovered = None
+        self.focused = None
+
+    def _set_hovered(self, button: Clickable | None) -> None:
+        """Переносит подсветку наведения."""
+        if button is self.hovered:
+            return
+        if self.hovered is not None and self.hovered is not self.focused:
+            self.hovered.set_highlight(False)
+        self.hovered = button
+        if button is not None:
+            button.set_highlight(True)
+
+    def _move_focus(self, step: int) -> None:
+        """Передаёт фокус следующей или предыдущей кнопке."""
+        if not self._order:
+            return
+        if self.focused is None:
+            idx = 0 if step > 0 else len(self._order) - 1
+        else:
+            self.focused.set_highlight(self.focused is self.hovered)
+            idx = (self._order.index(self.focused) + step) % len(self._order)
+        self.focused = self._order[idx]
+        self.focused.set_highlight(True)
@@ -0,0 +1,122 @@
+"""Модуль тонкого клиента: экран викторины, ход игры ведёт сервер (server.py).
+
+Запуск:
+    python client.py [--host 127.0.0.1] [--port 8765]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import socket
+import threading
+from collections.abc import Sequence
+from typing import Any
+
+import config as cfg
+from session import QuizSession
+
+
+class ServerConnection:
+    """Синхронное подключение к серверу: запрос - ответ."""
+
+    def __init__(self, host: str, port: int) -> None:
+        """Подключается к host:port."""
+        self._socket = socket.create_connection((host, port))
+        self._file = self._socket.makefile("rwb")
+        self._lock = threading.Lock()
+
+    def request(self, message: dict[str, Any]) -> dict[str, Any]:
+        """Отправляет запрос и возвращает ответ сервера."""
+        with self._lock:
+            self._file.write(json.dumps(message, ensure_ascii=False).encode() + b"\n")
+            self._file.flush()
+            line = self._file.readline()
+        if not line:
+            raise ConnectionError("сервер закрыл соединение")
+        response = json.loads(line)
+        if "error" in response:
+            raise RuntimeError(response["error"])
+        return response
+
+    def close(self) -> None:
+        """Закрывает подключение."""
+        self._file.close()
+        self._socket.close()
+
+
+class RemoteQuestions(Sequence):
+    """Вопросы сессии на сервере, запрашиваются по номеру и запоминаются."""
+
+    def __init__(self, session: RemoteSession, total: int) -> None:
+        """Вопросы сессии session."""
+        self._session = session
+        self._total = total
+        self._cache: dict[int, dict] = {}
+
+    def __len__(self) -> int:
+        """Количество вопросов."""
+        return self._total
+
+    def __getitem__(self, idx: int) -> dict:  # type: ignore[override]
+        """Вопрос без правильного ответа."""
+        if not 0 <= idx < self._total:
+            raise IndexError(idx)
+        question = self._cache.get(idx)
+        if question is None:
+            question = self._cache[idx] = self._session.connection.request(
+                {"op": "question", "session": self._session.session_id, "idx": idx},
+            )["question"]
+        return question
+
+
+class RemoteSession(QuizSession):
+    """Сессия, которую ведёт сервер; интерфейс как у QuizSession."""
+
+    def __init__(self, connection: ServerConnection, difficulty: str) -> None:
+        """Открывает на сервере сессию сложности difficulty."""
+        self.connection = connection
+        response = connection.request({"op": "start", "difficulty": difficulty})
+        self.session_id = response["session"]
+        super().__init__(RemoteQuestions(self, response["total"]))
+        self._apply(response)
+
+    def _apply(self, state: dict[str, Any]) -> None:
+        """Принимает состояние сессии от сервера."""
+        self.current_question_idx = state["idx"]
+        self.right_answer_counter = state["right"]
+        self.wrong_answer_counter = state["wrong"]
+        self.finished = state["finished"]
+        if "question" in state:
+            self.questions._cache[state["idx"]] = state["question"]
+
+    def answer(self, option_idx: int) -> bool:
+        """Отправляет ответ серверу."""
+        response = self.connection.request(
+            {"op": "answer", "session": self.session_id, "option": option_idx},
+        )
+        self._apply(response)
+        return response["correct"]
+
+    def reset(self) -> None:
+        """Начинает сессию на сервере заново."""
+        self._apply(self.connection.request({"op": "reset", "session": self.session_id}))
+
+
+def main(host: str, port: int) -> None:
+    """Запускает приложение со сложностями, которые отдаёт сервер."""
+    from main import App  # main сам импортирует этот модуль
+
+    connection = ServerConnection(host, port)
+    app = App(remote=connection)
+    try:
+        app.mainloop()
+    finally:
+        connection.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Тонкий клиент викторины")
+    parser.add_argument("--host", default=cfg.SERVER_HOST)
+    parser.add_argument("--port", type=int, default=cfg.SERVER_PORT)
+    args = parser.parse_args()
+    main(args.host, args.port)
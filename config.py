@@ -3,11 +3,14 @@ from pathlib import Path
 
 import pygame as pg
 
-# Шрифты
-pg.font.init()
-FONT_BUTTON = pg.font.Font(None, 50)
-FONT_QUESTIONBOX = pg.font.Font(None, 70)
-FONT_TEXT = pg.font.Font(None, 70)
+# Шрифты: FONT_BUTTON, FONT_QUESTIONBOX, FONT_TEXT, FONT_HUD
+# создаются при первом обращении (см. __getattr__ внизу модуля)
+FONT_SIZES = {
+    "button": 50,
+    "questionbox": 70,
+    "text": 70,
+    "hud": 24,
+}
 
 # Цвета
 RED = (255, 0, 0)
@@ -15,11 +18,122 @@ GREEN = (0, 255, 0)
 BLUE = (0, 0, 255)
 BLACK = (0, 0, 0)
 WHITE = (255, 255, 255)
+BUTTON_COLOR = (230, 230, 230)
+BUTTON_HIGHLIGHT_COLOR = (190, 210, 255)
+# Отступ текста кнопки от края
+BUTTON_PADDING = 10
+
+# Размер окна, (0, 0) - во весь экран; pg.RESIZABLE в флагах разрешает
+# менять размер окна
+SCREEN_SIZE = (0, 0)
+WINDOW_FLAGS = 0
+# Отрисовка: "surface" - поверхности и обновление изменившихся областей,
+# "texture" - текстуры SDL2 Renderer (texture_renderer.py)
+RENDER_BACKEND = "surface"
+
+# Частота кадров
+FPS = 60  # ограничение кадров в секунду при анимации
+IDLE_TIMEOUT_MS = 500  # сколько ждать событие в режиме простоя
 
 base_path = Path(__file__).parent
 
 MEDIA_PATH = base_path / "media"
 
 BACKGROUND_PATH = MEDIA_PATH / "background.jpg"
+# Фон, подготовленный под разрешение экрана, кэшируется здесь
+CACHE_PATH = base_path / ".cache"
 BACKGROUND_MUSIC_PATH = MEDIA_PATH / "music.mp3"
 CLICK_PATH = MEDIA_PATH / "click.wav"
+
+# Скомпилированный банк вопросов (python question_bank.py) и его источник:
+# база, собранная из другой версии источника, не используется
+QUESTIONS_DB_PATH = base_path / "questions.db"
+QUESTIONS_SOURCE_PATH = base_path / "questions.py"
+QUESTION_CACHE_SIZE = 64
+
+# Бюджет памяти кэша масштабированных изображений, байт
+IMAGE_CACHE_BUDGET = 32 * 1024 * 1024
+
+# Бюджет памяти кэша отрисованных надписей, байт
+TEXT_CACHE_BUDGET = 8 * 1024 * 1024
+
+# Атлас для картинок вопросов и фонов кнопок: размер и число страниц
+ATLAS_PAGE_SIZE = 1024
+ATLAS_MAX_PAGES = 4
+
+# Создавать все сцены при запуске, а не при первом показе
+PREBUILD_SCENES = True
+
+# Размер ячейки сетки для поиска кнопки под курсором, пикселей
+CLICK_GRID_CELL = 128
+
+# Сколько разбиений текста на строки хранить
+LAYOUT_CACHE_SIZE = 1024
+
+# Размечать все вопросы при запуске (question_layout.py) и хранить
+# разметку в CACHE_PATH
+PRECOMPILE_LAYOUTS = True
+LAYOUT_DISK_CACHE = True
+
+# Потоки фоновой подготовки следующего вопроса
+PREFETCH_WORKERS = 2
+
+# Звуки, загружаемые через менеджер ресурсов (assets.py)
+SOUND_PATHS = {
+    "click": CLICK_PATH,
+}
+
+# Звук (audio.py): параметры микшера, каналы под эффекты, громкость и
+# время смены музыки, мс
+AUDIO_FREQUENCY = 44100
+AUDIO_BUFFER = 512
+AUDIO_UI_CHANNELS = 4
+EFFECTS_VOLUME = 1.0
+MUSIC_VOLUME = 0.2
+MUSIC_FADE_MS = 800
+# Музыка сцен по имени сцены; для остальных - BACKGROUND_MUSIC_PATH
+SCENE_MUSIC = {
+    "menu": BACKGROUND_MUSIC_PATH,
+}
+
+# Сервер сессий (server.py) и тонкий клиент (client.py)
+SERVER_HOST = "127.0.0.1"
+SERVER_PORT = 8765
+SERVER_LINE_LIMIT = 64 * 1024  # наибольшая длина сообщения, байт
+
+# Адаптивная викторина (selection.py): сколько вопросов, на сколько уровней
+# сдвигает уровень один ответ и точность весов вопросов
+ADAPTIVE_ENABLED = True
+ADAPTIVE_QUIZ_LENGTH = 10
+ADAPTIVE_STEP = 0.5
+SELECTION_WEIGHT_SCALE = 1000
+# Недавно отвеченный вопрос весит вдвое меньше, разница тает за это время, с
+SELECTION_RECENCY = 24 * 60 * 60
+
+# Журнал ответов (answer_log.py): файл, размер пачки и как часто писать, с
+ANSWER_LOG_ENABLED = True
+ANSWER_LOG_PATH = base_path / "answers.log"
+ANSWER_LOG_BATCH = 256
+ANSWER_LOG_FLUSH_INTERVAL = 1.0
+# Номер сложности в записи - её место здесь, общее для всех процессов,
+# пишущих в журнал; новые сложности добавляются только в конец
+ANSWER_LOG_DIFFICULTIES = ("easy", "medium", "hard")
+
+# Профилирование: сколько кадров держать для процентилей,
+# сколько событий хранить для выгрузки и куда её писать
+PROFILER_WINDOW = 300
+PROFILER_TRACE_EVENTS = 20000
+PROFILER_TRACE_PATH = base_path / "trace.json"
+PROFILER_OVERLAY_KEY = pg.K_F3
+PROFILER_DUMP_KEY = pg.K_F4
+
+
+def __getattr__(name: str) -> pg.font.Font:
+    """Создаёт шрифт FONT_<ИМЯ> из FONT_SIZES при первом обращении."""
+    size_name = name.removeprefix("FONT_").lower()
+    if not name.startswith("FONT_") or size_name not in FONT_SIZES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    if not pg.font.get_init():
+        pg.font.init()
+    font = globals()[name] = pg.font.Font(None, FONT_SIZES[size_name])
+    return font
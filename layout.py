@@ -0,0 +1,100 @@
+"""Модуль разметки текста: перенос строк с кэшем измерений."""
+from __future__ import annotations
+
+import threading
+
+import config as cfg
+from assets import assets
+
+
+class TextLayout:
+    """Переносит текст по ширине за линейное время.
+
+    Ширина каждого слова и символа измеряется один раз для шрифта,
+    готовые разбиения запоминаются по (текст, шрифт, ширина).
+    Шрифт задаётся именем из cfg.FONT_SIZES, поэтому результаты общие
+    для главного и фоновых потоков.
+    """
+
+    def __init__(self, max_entries: int = cfg.LAYOUT_CACHE_SIZE) -> None:
+        """Кэши пусты, заполняются по мере разметки."""
+        self.max_entries = max_entries
+        self._widths: dict[str, dict[str, int]] = {}
+        self._lines: dict[tuple[str, str, int], tuple[str, ...]] = {}
+        # Кэш разбиений меняют главный поток и фоновые, вытеснение - под замком
+        self._lines_lock = threading.Lock()
+
+    def width(self, text: str, font_name: str) -> int:
+        """Ширина строки в пикселях, измеряется один раз."""
+        widths = self._widths.setdefault(font_name, {})
+        width = widths.get(text)
+        if width is None:
+            width = widths[text] = assets.thread_font(font_name).size(text)[0]
+        return width
+
+    def line_height(self, font_name: str) -> int:
+        """Высота строки шрифта."""
+        return assets.thread_font(font_name).get_height()
+
+    def wrap(self, text: str, font_name: str, max_width: int) -> list[str]:
+        """Разбивает текст на строки, не превышающие max_width."""
+        key = (text, font_name, max_width)
+        lines = self._lines.get(key)
+        if lines is None:
+            lines = tuple(self._wrap(text, font_name, max_width))
+            with self._lines_lock:
+                if len(self._lines) >= self.max_entries:
+                    del self._lines[next(iter(self._lines))]
+                self._lines[key] = lines
+        return list(lines)
+
+    def _wrap(self, text: str, font_name: str, max_width: int) -> list[str]:
+        """Разбиение без кэша: ширина строки накапливается по словам."""
+        space = self.width(" ", font_name)
+        hyphen = self.width("-", font_name)
+        lines = []
+        current: list[str] = []
+        # Ширина текущей строки вместе с пробелом после последнего слова
+        current_width = 0
+        for word in text.split(" "):
+            word_width = self.width(word, font_name)
+            if current_width + word_width + space <= max_width:
+                current.append(word)
+                current_width += word_width + space
+            elif word_width > max_width:
+                # Слово не помещается даже в пустую строку: режем с переносом
+                part = ""
+                part_width = 0
+                for char in word:
+                    char_width = self.width(char, font_name)
+                    if current_width + part_width + char_width + hyphen <= max_width:
+                        part += char
+                        part_width += char_width
+                    else:
+                        if current:
+                            lines.append(" ".join(current))
+                            current = []
+                            current_width = 0
+                        if part:
+                            lines.append(part + "-")
+                        part = char
+                        part_width = char_width
+                current = [part]
+                current_width = part_width + space
+            else:
+                if current:
+                    lines.append(" ".join(current))
+                current = [word]
+                current_width = word_width + space
+        if current:
+            lines.append(" ".join(current))
+        return lines
+
+    def clear(self) -> None:
+        """Сбрасывает кэши."""
+        self._widths.clear()
+        with self._lines_lock:
+            self._lines.clear()
+
+
+layout = TextLayout()
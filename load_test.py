@@ -0,0 +1,120 @@
+"""Модуль нагрузочного прогона сервера сессий.
+
+Каждый виртуальный клиент раз за разом проходит викторину случайными
+ответами. По умолчанию движок работает в этом же процессе
+(LocalTransport), с --tcp клиенты подключаются к запущенному server.py.
+Запуск:
+    python load_test.py [--clients 2000] [--seconds 10] [--tcp 127.0.0.1:8765]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import time
+from typing import Awaitable, Callable, Protocol
+
+from question_bank import load_banks
+from server import LocalTransport, SessionEngine, TcpTransport
+
+
+class Transport(Protocol):
+    """Общий интерфейс LocalTransport и TcpTransport."""
+
+    async def request(self, message: dict) -> dict:
+        """Отправляет запрос и ждёт ответ."""
+
+    async def close(self) -> None:
+        """Закрывает подключение."""
+
+
+class LoadStats:
+    """Счётчики прогона."""
+
+    def __init__(self) -> None:
+        """Пустые счётчики."""
+        self.latencies: list[float] = []
+        self.sessions = 0
+        self.errors = 0
+
+    async def timed(self, transport: Transport, message: dict) -> dict:
+        """Запрос с замером задержки."""
+        start = time.perf_counter()
+        response = await transport.request(message)
+        self.latencies.append(time.perf_counter() - start)
+        if "error" in response:
+            self.errors += 1
+        return response
+
+
+async def client(
+        connect: Callable[[], Awaitable[Transport]],
+        stats: LoadStats,
+        deadline: float,
+        seed: int,
+) -> None:
+    """Виртуальный клиент: проходит викторины до deadline."""
+    rng = random.Random(seed)
+    transport = await connect()
+    difficulties = (await stats.timed(transport, {"op": "difficulties"}))["difficulties"]
+    try:
+        while time.perf_counter() < deadline:
+            state = await stats.timed(
+                transport, {"op": "start", "difficulty": rng.choice(difficulties)},
+            )
+            session_id = state["session"]
+            while not state["finished"]:
+                option = rng.randrange(len(state["question"]["options"]))
+                state = await stats.timed(
+                    transport, {"op": "answer", "session": session_id, "option": option},
+                )
+            await stats.timed(transport, {"op": "close", "session": session_id})
+            stats.sessions += 1
+    finally:
+        await transport.close()
+
+
+async def run(clients: int, seconds: float, tcp: str | None) -> LoadStats:
+    """Запускает clients клиентов на seconds секунд."""
+    stats = LoadStats()
+    if tcp is None:
+        engine = SessionEngine(load_banks())
+
+        async def connect() -> Transport:
+            return LocalTransport(engine)
+    else:
+        host, port = tcp.rsplit(":", 1)
+
+        async def connect() -> Transport:
+            return await TcpTransport.connect(host, int(port))
+
+    deadline = time.perf_counter() + seconds
+    await asyncio.gather(*(client(connect, stats, deadline, seed) for seed in range(clients)))
+    return stats
+
+
+def report(stats: LoadStats, elapsed: float) -> None:
+    """Печатает итоги прогона."""
+    latencies = sorted(stats.latencies)
+    last = len(latencies) - 1
+
+    def percentile(point: float) -> float:
+        return latencies[round(last * point / 100)] * 1000 if latencies else 0.0
+
+    print(f"Сессий пройдено: {stats.sessions} ({stats.sessions / elapsed:.0f}/с)")
+    print(f"Запросов: {len(latencies)} ({len(latencies) / elapsed:.0f}/с), ошибок: {stats.errors}")
+    print(
+        f"Задержка p50 {percentile(50):.2f} мс, p95 {percentile(95):.2f} мс, "
+        f"p99 {percentile(99):.2f} мс",
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Нагрузочный прогон сервера викторины")
+    parser.add_argument("--clients", type=int, default=2000)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--tcp", help="адрес сервера host:port; без него - в этом процессе")
+    args = parser.parse_args()
+    start = time.perf_counter()
+    result = asyncio.run(run(args.clients, args.seconds, args.tcp))
+    report(result, time.perf_counter() - start)
@@ -1,104 +1,362 @@
 """Модуль приложения."""
+from __future__ import annotations
 
-from typing import Callable
+import sys
+import time
+from collections.abc import Sequence
+from concurrent.futures import Future
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable
+
+# Время до первого кадра (--startup-time) считается с импорта pygame и модулей
+STARTED_AT = time.perf_counter()
 
 import pygame as pg
 
 import config as cfg
-from questions import easy, hard, medium
+from answer_log import AnswerLog, aggregate
+from assets import assets
+from audio import audio
+from background import prepare_background
+from clicks import ClickLayer
+from layout import layout
+from profiler import FrameProfiler, PerfOverlay
+from question_bank import load_banks
+from question_layout import question_layouts
 from quiz import Button, Quiz, Text
+from scenes import Scene, SceneManager
+from selection import AdaptiveSession, QuestionSelector
+from session import QuizSession
+
+if TYPE_CHECKING:
+    from client import ServerConnection
+    from texture_renderer import TextureRenderer
+
+BACKGROUND_READY = pg.event.custom_type()
+
+# Названия сложностей в меню и соответствующие банки вопросов
+DIFFICULTIES = {
+    "Лаборант космической программы": "easy",
+    "Нобелевский лауреат": "medium",
+    "Автор теории Всего": "hard",
+}
+# Пункт меню адаптивной викторины, вопросы из всех банков
+ADAPTIVE_TITLE = "Адаптивная викторина"
+
+
+def _post_background_ready(future: Future[pg.Surface]) -> None:
+    """Будит главный цикл, когда фон прочитан."""
+    try:
+        pg.event.post(pg.event.Event(BACKGROUND_READY))
+    except pg.error:
+        # Приложение уже закрыто
+        pass
 
 
 class App:
     """Приложение."""
 
-    def __init__(self) -> None:
-        """Приложение."""
+    def __init__(
+            self,
+            measure_startup: bool = False,
+            remote: ServerConnection | None = None,
+            backend: str | None = None,
+    ) -> None:
+        """Приложение.
+
+        Здесь делается только нужное для первого кадра с меню: фон
+        читается в фоновом потоке, музыка и остальные сцены загружаются
+        после первого кадра. С measure_startup приложение печатает время
+        от запуска до первого кадра и закрывается. С remote викторины
+        ведёт сервер (см. client.py). backend - "surface" или "texture"
+        (см. texture_renderer.py), по умолчанию cfg.RENDER_BACKEND.
+        """
+        self.measure_startup = measure_startup
+        audio.pre_init()
         pg.init()
-        pg.mixer.init()
 
-        self.screen = pg.display.set_mode()
+        backend = backend or cfg.RENDER_BACKEND
+        self.textures: TextureRenderer | None = None
+        if backend == "texture":
+            # pygame._sdl2 нужен только этому способу отрисовки
+            from texture_renderer import TextureRenderer
+
+            self.textures = TextureRenderer(cfg.SCREEN_SIZE, cfg.WINDOW_FLAGS)
+            self.screen = self.textures.screen
+        elif backend == "surface":
+            self.screen = pg.display.set_mode(cfg.SCREEN_SIZE, cfg.WINDOW_FLAGS)
+        else:
+            raise ValueError(f"Неизвестный способ отрисовки {backend!r}")
+        self.clock = pg.time.Clock()
+        self.profiler = FrameProfiler()
+        self.overlay = PerfOverlay(self.profiler, audio)
         self.is_running = False
-
-        self.background = pg.image.load(cfg.BACKGROUND_PATH).convert()
-        pg.mixer.music.load(cfg.BACKGROUND_MUSIC_PATH)
-
-        screen_size = self.screen.get_size()
-        img_rect = self.background.get_rect()
-        crop_rect = pg.Rect(
-            (img_rect.width - screen_size[0]) // 2,
-            (img_rect.height - screen_size[1]) // 2,
-            screen_size[0],
-            screen_size[1],
+        self.need_redraw = True
+
+        # Пока фон читается, показываем заливку
+        self.background = pg.Surface(self.screen.get_size())
+        self.background.fill(cfg.BLACK)
+        self._background_future: Future[pg.Surface] | None = None
+        self._load_background()
+
+        self.difficulties: dict[str, Callable[[], QuizSession]] = {}
+        self.answer_log = None
+        if cfg.ANSWER_LOG_ENABLED:
+            self.answer_log = AnswerLog(cfg.ANSWER_LOG_PATH)
+        self.scenes = SceneManager()
+        self.scenes.register(
+            "menu",
+            lambda: Menu(
+                self.screen,
+                self.start_quiz,
+                list(self.difficulties.keys()),
+                self.exit_app,
+            ),
         )
-        self.background = self.background.subsurface(crop_rect)
-
-        self.difficulty_questions = {
-            "Лаборант космической программы": easy,
-            "Нобелевский лауреат": medium,
-            "Автор теории Всего": hard,
-        }
-
-        self.scene = Menu(
-            self.screen,
-            self.start_quiz,
-            list(self.difficulty_questions.keys()),
-            self.exit_app,
+        # Локальные банки вопросов; при игре через сервер их нет
+        self.banks: dict[str, Sequence[dict]] = {}
+        if remote is None:
+            banks = self.banks = load_banks()
+            for difficulty, bank in DIFFICULTIES.items():
+                self.add_difficulty(difficulty, banks[bank])
+            if cfg.ADAPTIVE_ENABLED:
+                self.add_adaptive(banks)
+        else:
+            from client import RemoteSession
+
+            offered = remote.request({"op": "difficulties"})["difficulties"]
+            for difficulty, bank in DIFFICULTIES.items():
+                if bank in offered:
+                    self.add_difficulty(
+                        difficulty,
+                        session_factory=lambda b=bank: RemoteSession(remote, b),
+                    )
+
+        self.set_scene(self.scenes.activate("menu"))
+        audio.play_music(self._scene_music("menu"))
+
+    def add_difficulty(
+            self,
+            difficulty: str,
+            questions: Sequence[dict] | None = None,
+            session_factory: Callable[[], QuizSession] | None = None,
+            prebuild: bool = True,
+    ) -> None:
+        """Добавляет сложность и пересобирает меню.
+
+        Для локальной игры передаются вопросы, для игры через сервер -
+        фабрика сессий. Без prebuild сцена создаётся при первом запуске.
+        """
+        if session_factory is None:
+            def session_factory() -> QuizSession:
+                bank = DIFFICULTIES.get(difficulty, difficulty)
+                return QuizSession(questions, bank, self.answer_log)
+        self.difficulties[difficulty] = session_factory
+
+        def build() -> Quiz:
+            session = session_factory()
+            return Quiz(self.screen, session.questions, self.return_to_menu, session)
+
+        self.scenes.register(difficulty, build, prebuild)
+        self.scenes.discard("menu")
+
+    def add_adaptive(self, banks: dict[str, Sequence[dict]]) -> None:
+        """Добавляет адаптивную викторину по банкам banks.
+
+        Выбор вопросов готовится в фоновом потоке: веса берутся из
+        журнала ответов, а его чтение не должно задерживать меню. Сцена
+        не создаётся заранее, чтобы prebuild() не ждал этого чтения.
+        """
+        def build_selector() -> QuestionSelector:
+            history = None
+            if cfg.ANSWER_LOG_PATH.is_file():
+                history = aggregate(cfg.ANSWER_LOG_PATH)
+            return QuestionSelector(banks, history)
+
+        selector = assets.submit(build_selector)
+
+        def session_factory() -> QuizSession:
+            return AdaptiveSession(selector.result(), log=self.answer_log)
+
+        self.add_difficulty(
+            ADAPTIVE_TITLE, session_factory=session_factory, prebuild=False,
         )
 
-        self.mainloop()
+    def set_scene(self, scene: Scene) -> None:
+        """Делает сцену текущей и требует полной перерисовки экрана."""
+        self.scene = scene
+        self.scene.sprites.clear(self.screen, self.background)
+        self.need_redraw = True
+        self.full_redraw = True
 
     def start_quiz(self, difficulty: str) -> None:
         """Запускает викторину с выбранной сложностью."""
-        questions = self.difficulty_questions[difficulty]
-        self.scene = Quiz(self.screen, questions, self.return_to_menu)
+        self.set_scene(self.scenes.activate(difficulty))
+        audio.play_music(self._scene_music(difficulty))
 
     def return_to_menu(self) -> None:
         """Возвращает в меню."""
-        self.scene = Menu(
-            self.screen,
-            self.start_quiz,
-            list(self.difficulty_questions.keys()),
-            self.exit_app,
-        )
+        self.set_scene(self.scenes.activate("menu"))
+        audio.play_music(self._scene_music("menu"))
+
+    @staticmethod
+    def _scene_music(name: str) -> Path:
+        """Музыка сцены name."""
+        return cfg.SCENE_MUSIC.get(name, cfg.BACKGROUND_MUSIC_PATH)
 
     def exit_app(self) -> None:
         """Выходит и приложения."""
         self.is_running = False
 
+    def finish_startup(self, wait_background: bool = True) -> None:
+        """Загружает то, что не нужно для первого кадра.
+
+        Без wait_background фон подставится позже, по событию BACKGROUND_READY.
+        """
+        if wait_background:
+            self._apply_background(wait=True)
+        audio.start()
+        if cfg.PRECOMPILE_LAYOUTS and self.banks:
+            assets.submit(question_layouts.compile, self.banks, self.screen.get_size())
+        if cfg.PREBUILD_SCENES:
+            self.scenes.prebuild()
+
+    def _load_background(self) -> None:
+        """Начинает готовить фон под текущий размер экрана в фоновом потоке."""
+        self._background_future = assets.submit(
+            prepare_background, self.screen.get_size(),
+        )
+        self._background_future.add_done_callback(_post_background_ready)
+
+    def _apply_background(self, wait: bool = False) -> None:
+        """Заменяет заглушку подготовленным фоном, если он готов или wait."""
+        future = self._background_future
+        if future is None or not (wait or future.done()):
+            return
+        self._background_future = None
+        self.background = future.result().convert()
+        self.scene.sprites.clear(self.screen, self.background)
+        self.need_redraw = True
+        self.full_redraw = True
+
     def mainloop(self) -> None:
         """Главный цикл."""
         self.is_running = True
-        pg.mixer.music.set_volume(0.2)
-        pg.mixer.music.play(loops=-1)
+        self.render()
+        if self.measure_startup:
+            elapsed = (time.perf_counter() - STARTED_AT) * 1000
+            print(f"Первый кадр через {elapsed:.1f} мс после запуска")
+            self.is_running = False
+        else:
+            self.finish_startup(wait_background=False)
         while self.is_running:
+            self.profiler.begin_frame()
             self.handle_events()
             self.update()
-            self.render()
-        pg.mixer.music.stop()
+            if self.need_redraw or self.scene.is_animated() or self.overlay.visible:
+                self.render()
+                self.need_redraw = False
+                # Проходы без отрисовки (вышло время ожидания) - не кадры
+                self.profiler.end_frame()
+            if self.scene.is_animated():
+                self.clock.tick(cfg.FPS)
+        audio.stop()
+        if self.answer_log is not None:
+            self.answer_log.close()
         pg.quit()
 
     def update(self) -> None:
         """Обновление событий."""
-        self.scene.update()
+        with self.profiler.phase(f"{type(self.scene).__name__}.update"):
+            self.scene.update()
 
     def handle_events(self) -> None:
         """Сбор событий и реакция на них."""
-        events = pg.event.get()
+        with self.profiler.phase("event.wait", idle=True):
+            events = self._collect_events()
+        if events:
+            self.need_redraw = True
         for event in events:
+            if event.type in (pg.MOUSEBUTTONDOWN, pg.KEYDOWN):
+                audio.mark_input()
             if event.type == pg.QUIT:
                 self.is_running = False
             elif event.type == pg.KEYDOWN:
                 if event.key == pg.K_ESCAPE:
                     self.is_running = False
-
-        self.scene.handle_events(events)
+                elif event.key == cfg.PROFILER_OVERLAY_KEY:
+                    self.toggle_overlay()
+                elif event.key == cfg.PROFILER_DUMP_KEY:
+                    self.profiler.dump_trace(cfg.PROFILER_TRACE_PATH)
+            elif event.type == BACKGROUND_READY:
+                self._apply_background()
+            elif event.type == pg.VIDEORESIZE:
+                self._resize()
+
+        with self.profiler.phase(f"{type(self.scene).__name__}.handle_events"):
+            self.scene.handle_events(events)
+
+    def _resize(self) -> None:
+        """Подгоняет фон под новый размер окна."""
+        if self.textures is not None:
+            self.screen = self.textures.resize()
+        else:
+            self.screen = pg.display.get_surface()
+        if self.background.get_size() == self.screen.get_size():
+            return
+        # До готовности нового фона растягиваем старый
+        self.background = pg.transform.scale(self.background, self.screen.get_size())
+        self.scene.sprites.clear(self.screen, self.background)
+        self.full_redraw = True
+        self._load_background()
+
+    def toggle_overlay(self) -> None:
+        """Показывает или скрывает оверлей профайлера."""
+        if self.overlay.rect is not None:
+            self.scene.sprites.repaint_rect(self.overlay.rect)
+            self.overlay.rect = None
+        self.overlay.toggle()
+
+    def _collect_events(self) -> list[pg.event.Event]:
+        """Собирает события.
+
+        Если сцене не нужны непрерывные кадры, блокируется в ожидании
+        события, чтобы неизменный экран не нагружал процессор.
+        """
+        if self.scene.is_animated():
+            return pg.event.get()
+        event = pg.event.wait(cfg.IDLE_TIMEOUT_MS)
+        if event.type == pg.NOEVENT:
+            return []
+        return [event, *pg.event.get()]
 
     def render(self) -> None:
-        """Отрисовка."""
-        self.screen.blit(self.background, (0, 0))
-        self.scene.render()
-        pg.display.flip()
+        """Отрисовка.
+
+        Обновляются только области изменившихся спрайтов, весь экран
+        перерисовывается лишь при смене сцены. С текстурами кадр каждый
+        раз собирается целиком.
+        """
+        if self.textures is not None:
+            overlays = []
+            if self.overlay.visible:
+                overlays.append(self.overlay.panel(self.screen.get_height()))
+            self.full_redraw = False
+            with self.profiler.phase("textures.draw"):
+                self.textures.draw(self.background, self.scene.sprites, overlays)
+            return
+        if self.full_redraw:
+            self.scene.sprites.repaint_rect(self.screen.get_rect())
+            self.full_redraw = False
+        if self.overlay.rect is not None:
+            # Под прошлым кадром оверлея сцена перерисует фон и спрайты
+            self.scene.sprites.repaint_rect(self.overlay.rect)
+        with self.profiler.phase(f"{type(self.scene).__name__}.render"):
+            rects = self.scene.render()
+        if self.overlay.visible:
+            rects.append(self.overlay.draw(self.screen))
+        with self.profiler.phase("display.update"):
+            pg.display.update(rects)
 
 
 class Menu:
@@ -116,7 +374,8 @@ class Menu:
         self.callback = callback
         self.difficulties = difficulties
         self.exit_callback = exit_callback
-        self.sprites = pg.sprite.Group()
+        self.sprites = pg.sprite.LayeredDirty()
+        self.clickable = ClickLayer()
         self._create_widgets()
 
     def _create_widgets(self) -> None:
@@ -125,8 +384,7 @@ class Menu:
 
         # Заголовок
         title_text = "Выберите сложность"
-        title_surf = cfg.FONT_TEXT.render(title_text, True, cfg.GREEN)
-        title_x = (screen_width - title_surf.get_width()) / 2
+        title_x = (screen_width - layout.width(title_text, "text")) / 2
         title_y = int(screen_height * 0.1)
         Text(self.sprites, title_text, (title_x, title_y))
 
@@ -138,7 +396,7 @@ class Menu:
         current_y = button_y_start
 
         for diff in self.difficulties:
-            button_text = [diff]
+            button_text = layout.wrap(diff, "button", button_width)
             btn = Button(
                 self.sprites,
                 button_text,
@@ -155,22 +413,31 @@ class Menu:
             (10, 10),
             self.exit_callback,
         )
+        self.clickable.rebuild(s for s in self.sprites if isinstance(s, Button))
 
     def update(self) -> None:
         """Обновление."""
 
-    def render(self) -> None:
-        """Отрисовка меню."""
-        self.sprites.draw(self.screen)
+    def reset(self) -> None:
+        """Снимает подсветку, оставшуюся с прошлого показа меню."""
+        self.clickable.clear_highlight()
+
+    def is_animated(self) -> bool:
+        """Нужны ли сцене непрерывные кадры."""
+        return False
+
+    def render(self) -> list[pg.Rect]:
+        """Отрисовка меню, возвращает изменившиеся области."""
+        return self.sprites.draw(self.screen)
 
     def handle_events(self, events: list[pg.event.Event]) -> None:
         """Обработка событий."""
         for event in events:
-            if event.type == pg.MOUSEBUTTONDOWN and event.button == 1:
-                for sprite in self.sprites:
-                    if isinstance(sprite, Button):
-                        sprite.on_click()
+            self.clickable.handle_event(event)
 
 
 if __name__ == "__main__":
-    App()
+    App(
+        measure_startup="--startup-time" in sys.argv,
+        backend="texture" if "--texture" in sys.argv else None,
+    ).mainloop()
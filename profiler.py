@@ -0,0 +1,154 @@
+"""Модуль профилирования кадров: замер фаз цикла, гистограммы и оверлей."""
+from __future__ import annotations
+
+import json
+import time
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pygame as pg
+
+import config as cfg
+
+if TYPE_CHECKING:
+    from audio import AudioSystem
+
+
+class FrameProfiler:
+    """Замеряет фазы главного цикла и время кадра.
+
+    Держит последние cfg.PROFILER_WINDOW кадров для процентилей и
+    кольцевой буфер событий для выгрузки в формате Chrome Trace
+    (открывается в chrome://tracing или ui.perfetto.dev).
+    """
+
+    def __init__(
+            self,
+            window: int = cfg.PROFILER_WINDOW,
+            trace_size: int = cfg.PROFILER_TRACE_EVENTS,
+    ) -> None:
+        """Профайлер без замеров."""
+        self.frame_times: deque[float] = deque(maxlen=window)
+        self.phase_times: dict[str, deque[float]] = {}
+        self.trace: deque[tuple[str, float, float]] = deque(maxlen=trace_size)
+        self.window = window
+        self._origin = time.perf_counter()
+        self._frame_start = 0.0
+        self._idle = 0.0
+
+    def begin_frame(self) -> None:
+        """Отмечает начало кадра; без end_frame() кадр не учитывается."""
+        self._frame_start = time.perf_counter()
+        self._idle = 0.0
+
+    def end_frame(self) -> None:
+        """Отмечает конец кадра; ожидание событий во время кадра не входит."""
+        end = time.perf_counter()
+        duration = end - self._frame_start - self._idle
+        self.frame_times.append(duration)
+        self.trace.append(("frame", self._frame_start, end - self._frame_start))
+
+    @contextmanager
+    def phase(self, name: str, idle: bool = False) -> Iterator[None]:
+        """Замеряет фазу name; idle-фаза не учитывается во времени кадра."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            if idle:
+                self._idle += duration
+            times = self.phase_times.get(name)
+            if times is None:
+                times = self.phase_times[name] = deque(maxlen=self.window)
+            times.append(duration)
+            self.trace.append((name, start, duration))
+
+    def percentiles(self, *points: float) -> list[float]:
+        """Время кадра в мс для процентилей points (0-100)."""
+        ordered = sorted(self.frame_times)
+        if not ordered:
+            return [0.0 for _ in points]
+        last = len(ordered) - 1
+        return [ordered[round(last * point / 100)] * 1000 for point in points]
+
+    def phase_means(self) -> dict[str, float]:
+        """Среднее время каждой фазы в мс."""
+        return {
+            name: sum(times) / len(times) * 1000
+            for name, times in self.phase_times.items()
+            if times
+        }
+
+    def dump_trace(self, path: Path) -> None:
+        """Записывает буфер событий в файл формата Chrome Trace."""
+        events = [
+            {
+                "name": name,
+                "ph": "X",
+                "ts": (start - self._origin) * 1e6,
+                "dur": duration * 1e6,
+                "pid": 0,
+                "tid": 0,
+            }
+            for name, start, duration in self.trace
+        ]
+        path.write_text(json.dumps({"traceEvents": events}), encoding="utf-8")
+
+
+class PerfOverlay:
+    """Оверлей с временем кадра и фаз в углу экрана."""
+
+    def __init__(
+            self,
+            profiler: FrameProfiler,
+            audio: AudioSystem | None = None,
+    ) -> None:
+        """Скрытый оверлей; с audio показывает и задержку звука."""
+        self.profiler = profiler
+        self.audio = audio
+        self.visible = False
+        self.rect: pg.Rect | None = None
+
+    def toggle(self) -> None:
+        """Показывает или скрывает оверлей."""
+        self.visible = not self.visible
+
+    def lines(self) -> list[str]:
+        """Строки оверлея."""
+        p50, p95, p99 = self.profiler.percentiles(50, 95, 99)
+        lines = [
+            f"frame p50 {p50:.2f}  p95 {p95:.2f}  p99 {p99:.2f} ms",
+            f"fps {1000 / p50:.0f}" if p50 else "fps -",
+        ]
+        for name, mean in sorted(self.profiler.phase_means().items()):
+            lines.append(f"{name:24} {mean:.2f} ms")
+        if self.audio is not None and self.audio.latencies:
+            latency = self.audio.latency_stats()
+            lines.append(
+                f"input->sound mean {latency['mean']:.1f}  "
+                f"p95 {latency['p95']:.1f}  max {latency['max']:.1f} ms",
+            )
+        return lines
+
+    def draw(self, screen: pg.Surface) -> pg.Rect:
+        """Рисует оверлей в левом нижнем углу, возвращает его область."""
+        panel, self.rect = self.panel(screen.get_height())
+        screen.blit(panel, self.rect)
+        return self.rect
+
+    def panel(self, screen_height: int) -> tuple[pg.Surface, pg.Rect]:
+        """Картинка оверлея и её место в левом нижнем углу экрана."""
+        font = cfg.FONT_HUD
+        rendered = [font.render(line, True, cfg.WHITE) for line in self.lines()]
+        padding = 6
+        width = max(surface.get_width() for surface in rendered) + padding * 2
+        height = font.get_linesize() * len(rendered) + padding * 2
+        panel = pg.Surface((width, height), pg.SRCALPHA)
+        panel.fill((0, 0, 0, 180))
+        for i, surface in enumerate(rendered):
+            panel.blit(surface, (padding, padding + i * font.get_linesize()))
+        return panel, panel.get_rect(bottomleft=(0, screen_height))
@@ -0,0 +1,270 @@
+"""Модуль банка вопросов: компиляция questions.py в SQLite и ленивое чтение.
+
+Сборка банка:
+    python question_bank.py [путь к файлу базы]
+В базе хранится отпечаток questions.py, из которого она собрана:
+после правки вопросов старая база не используется, пока её не пересоберут.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import sys
+from collections import OrderedDict
+from collections.abc import Iterator, Sequence
+from pathlib import Path
+from typing import Any, overload
+
+import config as cfg
+from question_model import Question
+
+SCHEMA = """
+CREATE TABLE questions (
+    difficulty TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    options TEXT NOT NULL,
+    answer_idx INTEGER NOT NULL,
+    image_name TEXT,
+    PRIMARY KEY (difficulty, idx)
+) WITHOUT ROWID;
+CREATE TABLE meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+class QuestionBank(Sequence):
+    """Вопросы одной сложности, читаемые из базы по индексу.
+
+    В памяти держатся только недавно прочитанные вопросы.
+    """
+
+    def __init__(
+            self,
+            path: Path,
+            difficulty: str,
+            cache_size: int = cfg.QUESTION_CACHE_SIZE,
+    ) -> None:
+        """Открывает банк difficulty из файла path."""
+        self.path = path
+        self.difficulty = difficulty
+        self.cache_size = cache_size
+        self._connection = sqlite3.connect(path)
+        self._cache: OrderedDict[int, Question] = OrderedDict()
+        (self._length,) = self._connection.execute(
+            "SELECT COUNT(*) FROM questions WHERE difficulty = ?", (difficulty,),
+        ).fetchone()
+
+    def __len__(self) -> int:
+        """Количество вопросов."""
+        return self._length
+
+    def __iter__(self) -> Iterator[Question]:
+        """Все вопросы по порядку одним запросом, мимо кэша.
+
+        Читает через своё соединение, поэтому годится для фоновых потоков.
+        """
+        connection = sqlite3.connect(self.path)
+        try:
+            rows = connection.execute(
+                "SELECT text, options, answer_idx, image_name FROM questions "
+                "WHERE difficulty = ? ORDER BY idx",
+                (self.difficulty,),
+            )
+            for row in rows:
+                yield _question(*row)
+        finally:
+            connection.close()
+
+    @overload
+    def __getitem__(self, idx: int) -> Question: ...
+
+    @overload
+    def __getitem__(self, idx: slice) -> list[Question]: ...
+
+    def __getitem__(self, idx: int | slice) -> Question | list[Question]:
+        """Вопрос в формате questions.py."""
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(self._length))]
+        if idx < 0:
+            idx += self._length
+        if not 0 <= idx < self._length:
+            raise IndexError(idx)
+        question = self._cache.get(idx)
+        if question is not None:
+            self._cache.move_to_end(idx)
+            return question
+        question = _question(*self._connection.execute(
+            "SELECT text, options, answer_idx, image_name FROM questions "
+            "WHERE difficulty = ? AND idx = ?",
+            (self.difficulty, idx),
+        ).fetchone())
+        self._cache[idx] = question
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return question
+
+
+def _question(
+        text: str,
+        options: str,
+        answer_idx: int,
+        image_name: str | None,
+) -> Question:
+    """Вопрос из строки таблицы."""
+    return Question(text, json.loads(options), answer_idx, image_name)
+
+
+def validate(difficulty: str, questions: list[dict]) -> tuple[list[str], list[str]]:
+    """Проверяет вопросы, возвращает ошибки и предупреждения."""
+    errors = []
+    warnings = []
+    for idx, question in enumerate(questions):
+        where = f"{difficulty}[{idx}]"
+        text = question.get("text")
+        if not isinstance(text, str) or not text:
+            errors.append(f"{where}: нет текста вопроса")
+        options = question.get("options")
+        if (
+            not isinstance(options, list)
+            or not options
+            or not all(isinstance(option, str) and option for option in options)
+        ):
+            errors.append(f"{where}: options должен быть непустым списком строк")
+            options = []
+        answer_idx = question.get("answer_idx")
+        if not isinstance(answer_idx, int) or not 0 <= answer_idx < len(options):
+            errors.append(f"{where}: answer_idx={answer_idx!r} вне списка options")
+        image_name = question.get("image_name")
+        if image_name is not None and not (cfg.MEDIA_PATH / image_name).is_file():
+            warnings.append(f"{where}: нет файла {image_name}, вопрос без картинки")
+    return errors, warnings
+
+
+def compile_bank(
+        banks: dict[str, list[dict]],
+        path: Path,
+        source: str | None = None,
+) -> list[str]:
+    """Записывает банки вопросов в базу path, возвращает предупреждения.
+
+    source - отпечаток источника (source_hash), по нему load_banks
+    узнаёт устаревшую базу. При ошибках в данных поднимает ValueError и
+    файл не трогает.
+    """
+    errors = []
+    warnings = []
+    for difficulty, questions in banks.items():
+        bank_errors, bank_warnings = validate(difficulty, questions)
+        errors += bank_errors
+        warnings += bank_warnings
+    if errors:
+        raise ValueError("\n".join(errors))
+
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    tmp_path.unlink(missing_ok=True)
+    connection = sqlite3.connect(tmp_path)
+    with connection:
+        connection.executescript(SCHEMA)
+        connection.executemany(
+            "INSERT INTO questions VALUES (?, ?, ?, ?, ?, ?)",
+            _rows(banks),
+        )
+        if source is not None:
+            connection.execute(
+                "INSERT INTO meta VALUES ('source_hash', ?)", (source,),
+            )
+    connection.close()
+    tmp_path.replace(path)
+    return warnings
+
+
+def _rows(banks: dict[str, list[dict]]) -> Any:
+    """Строки таблицы questions."""
+    for difficulty, questions in banks.items():
+        for idx, question in enumerate(questions):
+            image_name = question.get("image_name")
+            if image_name is not None and not (cfg.MEDIA_PATH / image_name).is_file():
+                image_name = None
+            yield (
+                difficulty,
+                idx,
+                question["text"],
+                json.dumps(question["options"], ensure_ascii=False),
+                question["answer_idx"],
+                image_name,
+            )
+
+
+def source_banks() -> dict[str, list[dict]]:
+    """Банки из questions.py."""
+    from questions import easy, hard, medium
+
+    return {"easy": easy, "medium": medium, "hard": hard}
+
+
+def source_hash(path: Path = cfg.QUESTIONS_SOURCE_PATH) -> str | None:
+    """Отпечаток файла вопросов или None, если файла нет."""
+    try:
+        return hashlib.sha1(path.read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+
+def compiled_hash(path: Path) -> str | None:
+    """Отпечаток источника, из которого собрана база path."""
+    connection = sqlite3.connect(path)
+    try:
+        row = connection.execute(
+            "SELECT value FROM meta WHERE key = 'source_hash'",
+        ).fetchone()
+    except sqlite3.Error:
+        # База собрана до появления отпечатков
+        row = None
+    finally:
+        connection.close()
+    return row[0] if row else None
+
+
+def load_banks(
+        path: Path = cfg.QUESTIONS_DB_PATH,
+        source_path: Path = cfg.QUESTIONS_SOURCE_PATH,
+) -> dict[str, Sequence[dict]]:
+    """Банки easy/medium/hard: из базы, если она собрана, иначе из questions.py.
+
+    Если база собрана из другой версии questions.py, вопросы берутся
+    из questions.py, а в stderr выводится предупреждение. Без
+    questions.py база используется как есть.
+
+    Списки questions.py отдаются как есть: модуль всё равно держит их в
+    памяти, и ColumnarBank только добавил бы копию и замедлил чтение.
+    Компактные форматы (question_model.py) экономят память, лишь когда
+    вопросы приходят из базы или внешних данных.
+    """
+    if path.is_file():
+        source = source_hash(source_path)
+        if source is None or compiled_hash(path) == source:
+            return {
+                name: QuestionBank(path, name) for name in ("easy", "medium", "hard")
+            }
+        print(
+            f"База {path} собрана из другой версии questions.py, вопросы "
+            "берутся из questions.py. Пересоберите её: python question_bank.py",
+            file=sys.stderr,
+        )
+    return source_banks()
+
+
+if __name__ == "__main__":
+    db_path = Path(sys.argv[1]) if len(sys.argv) > 1 else cfg.QUESTIONS_DB_PATH
+    try:
+        found = compile_bank(source_banks(), db_path, source_hash())
+    except ValueError as error:
+        print(error, file=sys.stderr)
+        sys.exit(1)
+    for warning in found:
+        print(warning, file=sys.stderr)
+    print(f"Банк вопросов записан в {db_path}")
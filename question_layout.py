@@ -0,0 +1,166 @@
+"""Модуль разметки экрана вопроса: строки и положения спрайтов заранее.
+
+Разметка зависит только от вопроса, размера экрана и шрифтов, поэтому
+её можно посчитать для всех банков при запуске или заранее:
+    python question_layout.py [ШxВ ...]
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import sys
+from collections.abc import Sequence
+from pathlib import Path
+
+import pygame as pg
+
+import cache_files
+import config as cfg
+from assets import assets
+from layout import layout
+
+# Меняется при изменении формата разметки, чтобы не читать старые файлы
+FORMAT_VERSION = 1
+
+
+def compute_layout(question: dict, size: tuple[int, int]) -> dict:
+    """Разметка вопроса для экрана size.
+
+    Ключи: "text" - строки вопроса как [строка, x, y], "image" -
+    [x, y, сторона] или None, "buttons" - варианты как [строки, x, y,
+    ширина, высота]. Можно вызывать из фонового потока.
+    """
+    width, height = size
+
+    # Текст c вопросом
+    text_x = int(width * 0.07)
+    text_y = int(height * 0.15)
+    text_max_width = int(width * 0.68)
+    line_height = layout.line_height("text")
+    text = [
+        [line, text_x, text_y + i * line_height]
+        for i, line in enumerate(layout.wrap(question["text"], "text", text_max_width))
+    ]
+
+    # Изображение (если есть, справа от текста)
+    image = None
+    image_name = question.get("image_name")
+    if image_name and assets.has_image(image_name):
+        image = [int(width * 0.79), int(height * 0.15), int(height * 0.27)]
+
+    # Кнопки
+    button_x = int(width * 0.2)
+    button_width = int(width * 0.6)
+    button_margin = 20
+    button_line_height = layout.line_height("button")
+    current_y = int(height * 0.6)
+    buttons = []
+    for option in question["options"]:
+        lines = layout.wrap(option, "button", button_width)
+        button_height = button_line_height * len(lines) + cfg.BUTTON_PADDING * 2
+        buttons.append([lines, button_x, current_y, button_width, button_height])
+        current_y += button_height + button_margin
+
+    return {"text": text, "image": image, "buttons": buttons}
+
+
+def question_key(question: dict) -> str:
+    """Ключ вопроса в скомпилированной разметке."""
+    return json.dumps(
+        [question["text"], question["options"], question.get("image_name")],
+        ensure_ascii=False,
+    )
+
+
+class LayoutStore:
+    """Скомпилированные разметки вопросов по размерам экрана."""
+
+    def __init__(self) -> None:
+        """Хранилище пусто, заполняется compile()."""
+        self._layouts: dict[tuple[int, int], dict[str, dict]] = {}
+
+    def get(self, question: dict, size: tuple[int, int]) -> dict | None:
+        """Готовая разметка вопроса или None, если она не скомпилирована."""
+        compiled = self._layouts.get(size)
+        if compiled is None:
+            return None
+        return compiled.get(question_key(question))
+
+    def compile(
+            self,
+            banks: dict[str, Sequence[dict]],
+            size: tuple[int, int],
+            use_disk: bool = cfg.LAYOUT_DISK_CACHE,
+    ) -> int:
+        """Размечает все вопросы banks для экрана size, возвращает их число.
+
+        С use_disk разметка читается из cfg.CACHE_PATH, если там есть файл
+        для тех же вопросов, размера и шрифтов, иначе записывается туда.
+        Можно вызывать из фонового потока.
+        """
+        keys = {
+            question_key(question): question
+            for questions in banks.values()
+            for question in questions
+        }
+        cache_path = _cache_path(keys, size)
+        compiled = None
+        if use_disk:
+            try:
+                compiled = json.loads(cache_path.read_text("utf-8"))
+            except (OSError, ValueError):
+                # Нет файла или он битый: разметим заново
+                pass
+        if compiled is None:
+            compiled = {
+                key: compute_layout(question, size) for key, question in keys.items()
+            }
+            if use_disk:
+                _store(compiled, cache_path, size)
+        # Одно присваивание: читатели видят либо всё, либо ничего
+        self._layouts[size] = compiled
+        return len(compiled)
+
+    def clear(self) -> None:
+        """Забывает скомпилированные разметки."""
+        self._layouts.clear()
+
+
+def _cache_path(keys: dict[str, dict], size: tuple[int, int]) -> Path:
+    """Файл разметки; в имени - размер и отпечаток вопросов и шрифтов."""
+    digest = hashlib.sha1()
+    digest.update(json.dumps(
+        [FORMAT_VERSION, pg.version.ver, cfg.FONT_SIZES, cfg.BUTTON_PADDING],
+    ).encode())
+    for key in sorted(keys):
+        digest.update(key.encode())
+    width, height = size
+    return cfg.CACHE_PATH / f"layout_{width}x{height}_{digest.hexdigest()[:16]}.json"
+
+
+def _store(compiled: dict[str, dict], cache_path: Path, size: tuple[int, int]) -> None:
+    """Сохраняет разметку, убирая устаревшие файлы того же размера."""
+    width, height = size
+    cache_files.store(
+        cache_path,
+        f"layout_{width}x{height}_*.json",
+        lambda tmp_path: tmp_path.write_text(
+            json.dumps(compiled, ensure_ascii=False), "utf-8",
+        ),
+    )
+
+
+question_layouts = LayoutStore()
+
+
+if __name__ == "__main__":
+    from question_bank import load_banks
+
+    sizes = [
+        tuple(int(side) for side in arg.split("x")) for arg in sys.argv[1:]
+    ] or [(1920, 1080)]
+    pg.font.init()
+    all_banks = load_banks()
+    for screen_size in sizes:
+        count = question_layouts.compile(all_banks, screen_size, use_disk=True)
+        print(f"{screen_size[0]}x{screen_size[1]}: размечено вопросов - {count}")
@@ -0,0 +1,131 @@
+"""Модуль компактных вопросов для больших банков.
+
+Question - запись со __slots__, ColumnarBank - банк, хранящий вопросы
+по столбцам в массивах. Оба читаются как словари questions.py
+(question["text"], question.get("image_name")), поэтому Quiz, сессии и
+сервер работают с ними без преобразований. Варианты ответов и имена
+изображений повторяются от вопроса к вопросу и хранятся по одному разу.
+"""
+from __future__ import annotations
+
+import sys
+from array import array
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from typing import Any, overload
+
+# Ключи вопроса в формате questions.py
+FIELDS = ("text", "options", "answer_idx", "image_name")
+
+
+class Question(Mapping):
+    """Вопрос без словаря атрибутов; читается и как словарь questions.py."""
+
+    __slots__ = FIELDS
+
+    def __init__(
+            self,
+            text: str,
+            options: Sequence[str],
+            answer_idx: int,
+            image_name: str | None = None,
+    ) -> None:
+        """Вопрос; варианты и имя изображения интернируются."""
+        self.text = text
+        self.options = tuple(sys.intern(option) for option in options)
+        self.answer_idx = answer_idx
+        self.image_name = sys.intern(image_name) if image_name else None
+
+    @classmethod
+    def from_mapping(cls, question: Mapping[str, Any]) -> Question:
+        """Вопрос из словаря в формате questions.py."""
+        return cls(
+            question["text"],
+            question["options"],
+            question["answer_idx"],
+            question.get("image_name"),
+        )
+
+    def __getitem__(self, key: str) -> Any:
+        """Поле по ключу; у вопроса без изображения нет "image_name"."""
+        if key not in FIELDS:
+            raise KeyError(key)
+        value = getattr(self, key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        """Ключи, как у словаря вопроса."""
+        return (key for key in FIELDS if getattr(self, key) is not None)
+
+    def __len__(self) -> int:
+        """Количество ключей."""
+        return 3 if self.image_name is None else 4
+
+    def __repr__(self) -> str:
+        """Запись в виде словаря."""
+        return f"Question({dict(self)!r})"
+
+
+class ColumnarBank(Sequence):
+    """Банк вопросов по столбцам: тексты - списком, остальное - массивами.
+
+    Строки вариантов и имён изображений лежат в общей таблице по
+    одному разу, вопросы хранят только их номера. Question собирается
+    при обращении и не хранится.
+    """
+
+    def __init__(self, questions: Iterable[Mapping[str, Any]]) -> None:
+        """Раскладывает вопросы по столбцам."""
+        self._texts: list[str] = []
+        self._strings: list[str] = []
+        string_ids: dict[str, int] = {}
+        # Варианты вопроса i - это _option_ids[_starts[i]:_starts[i + 1]]
+        self._option_ids = array("I")
+        self._starts = array("I", [0])
+        self._answers = array("B")
+        # Номер имени изображения плюс один; 0 - вопрос без изображения
+        self._images = array("I")
+
+        def string_id(string: str) -> int:
+            idx = string_ids.get(string)
+            if idx is None:
+                idx = string_ids[string] = len(self._strings)
+                self._strings.append(string)
+            return idx
+
+        for question in questions:
+            self._texts.append(question["text"])
+            self._option_ids.extend(string_id(option) for option in question["options"])
+            self._starts.append(len(self._option_ids))
+            self._answers.append(question["answer_idx"])
+            image_name = question.get("image_name")
+            self._images.append(string_id(image_name) + 1 if image_name else 0)
+
+    def __len__(self) -> int:
+        """Количество вопросов."""
+        return len(self._texts)
+
+    @overload
+    def __getitem__(self, idx: int) -> Question: ...
+
+    @overload
+    def __getitem__(self, idx: slice) -> list[Question]: ...
+
+    def __getitem__(self, idx: int | slice) -> Question | list[Question]:
+        """Вопрос idx."""
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(len(self)))]
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError(idx)
+        strings = self._strings
+        options = self._option_ids[self._starts[idx]:self._starts[idx + 1]]
+        image = self._images[idx]
+        return Question(
+            self._texts[idx],
+            [strings[option] for option in options],
+            self._answers[idx],
+            strings[image - 1] if image else None,
+        )
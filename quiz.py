@@ -1,11 +1,19 @@
 """Модуль викторины."""
 from __future__ import annotations
 
+from collections.abc import Sequence
+from concurrent.futures import Future
 from typing import Callable
 
 import pygame as pg
 
 import config as cfg
+from assets import assets
+from audio import audio
+from clicks import ClickLayer
+from layout import layout
+from question_layout import compute_layout, question_layouts
+from session import QuizSession
 
 
 class Quiz:
@@ -14,98 +22,188 @@ class Quiz:
     def __init__(
             self,
             screen: pg.Surface,
-            questions: list[dict],
+            questions: Sequence[dict],
             return_callback: Callable[[], None],
+            session: QuizSession | None = None,
     ) -> None:
-        """Викторина."""
+        """Викторина; ход игры ведёт session, по умолчанию локальная."""
         self.screen = screen
-        self.questions = questions
+        self.session = session if session is not None else QuizSession(questions)
+        self.questions = self.session.questions
         self.return_callback = return_callback
-        self.current_question_idx = 0
-        self.right_answer_counter = 0
-        self.wrong_answer_counter = 0
-        self.sprites = pg.sprite.Group()
+        self.sprites = pg.sprite.LayeredDirty()
+        self.clickable = ClickLayer()
+        self._layouts: dict[int, Future[dict]] = {}
+        # Спрайты экрана вопроса, переиспользуются от вопроса к вопросу
+        self.counter: Text | None = None
+        self.question_lines: list[Text] = []
+        self.picture: Image | None = None
+        self.buttons: list[Button] = []
+        self.make_widjets()
+
+    @property
+    def current_question_idx(self) -> int:
+        """Номер текущего вопроса."""
+        return self.session.current_question_idx
+
+    @property
+    def right_answer_counter(self) -> int:
+        """Количество правильных ответов."""
+        return self.session.right_answer_counter
+
+    @property
+    def wrong_answer_counter(self) -> int:
+        """Количество неправильных ответов."""
+        return self.session.wrong_answer_counter
+
+    def reset(self) -> None:
+        """Начинает викторину заново с первого вопроса."""
+        if not self.session.started:
+            # Сцена могла быть создана заранее: задержку считаем с показа
+            self.session.mark_shown()
+            return
+        self.session.reset()
+        # Заготовки разметки могли быть сделаны для других вопросов
+        self._layouts.clear()
+        self._clear()
         self.make_widjets()
 
     def make_widjets(self) -> None:
-        """Создает спрайты для текущего вопроса."""
-        question = self.questions[self.current_question_idx]
+        """Показывает текущий вопрос, меняя уже созданные спрайты."""
+        question = self.session.question
+        question_layout = self._take_layout(self.current_question_idx)
 
         # Счетчик
         counter = str(self.current_question_idx + 1) + " из " + str(len(self.questions))
-        Text(self.sprites, counter, (10, 10))
+        if self.counter is None:
+            self.counter = Text(self.sprites, counter, (10, 10))
+        else:
+            self.counter.text = counter
 
         # Текст c вопросом
-        text_x = int(self.screen.get_width() * 0.07)
-        text_y = int(self.screen.get_height() * 0.15)
-        text_max_width = int(self.screen.get_width() * 0.68)
-        self._create_text(question["text"], (text_x, text_y), text_max_width)
+        self._set_lines(self.question_lines, question_layout["text"])
 
         # Изображение (если есть, справа от текста)
-        image_x = int(self.screen.get_width() * 0.79)
-        image_y = int(self.screen.get_height() * 0.15)
-        image_max_size = int(self.screen.get_height() * 0.27)
-        image_name = question.get("image_name")
-        if image_name:
-            Image(self.sprites, image_name, (image_x, image_y), image_max_size)
+        if question_layout["image"] is not None:
+            image_x, image_y, image_max_size = question_layout["image"]
+            image_name = question["image_name"]
+            if self.picture is None:
+                self.picture = Image(
+                    self.sprites, image_name, (image_x, image_y), image_max_size,
+                )
+            else:
+                self.picture.image_name = image_name
+                self.picture.visible = 1
+        elif self.picture is not None:
+            self.picture.visible = 0
 
         # Кнопки
-        button_x = int(self.screen.get_width() * 0.2)
-        button_y = int(self.screen.get_height() * 0.6)
-        button_width = int(self.screen.get_width() * 0.6)
-        button_margin = 20
-        current_y = button_y
-
-        answer_idx = question["answer_idx"]
-        options = question["options"]
-
-        for idx, option in enumerate(options):
-            def callback(num: int) -> None:
-                """Эта функция вызывается при вызове кнопки."""
-                if answer_idx == num - 1:
-                    self.right_answer_counter += 1
-                else:
-                    self.wrong_answer_counter += 1
-
-                if len(self.questions) > self.current_question_idx + 1:
-                    self.current_question_idx += 1
-                    self.sprites.empty()
-                    self.make_widjets()
-                else:
-                    # Показ статистики
-                    self.sprites.empty()
-                    text_y = int(self.screen.get_height() * 0.15)
-                    text_x = int(self.screen.get_width() * 0.16)
-                    text_max_width = int(self.screen.get_width() * 0.76)
-                    percent = self.right_answer_counter / len(self.questions) * 100
-                    text = f"Вы ответили правильно на {round(percent)}% вопросов. "
-                    text += f"Дано правильных ответов - {self.right_answer_counter}, "
-                    text += f"а неправильных - {self.wrong_answer_counter}. "
-                    text += f"Всего вопросов {self.current_question_idx + 1}. "
-                    self._create_text(text, (text_x, text_y), text_max_width)
-
-                    # Кнопка "Вернуться в меню"
-                    button_x = int(self.screen.get_width() * 0.6)
-                    button_y = int(self.screen.get_height() * 0.8)
-                    button_width = int(self.screen.get_width() * 0.38)
-                    option = "Вернуться в меню"
-                    Button(
-                        self.sprites,
-                        self.wrap_text(option, cfg.FONT_BUTTON, button_width),
-                        (button_x, button_y),
-                        self.return_callback,
-                        max_width=button_width,
-                    )
-
-            # Создание кнопки
-            btn = Button(
-                self.sprites,
-                self.wrap_text(option, cfg.FONT_BUTTON, button_width),
-                (button_x, current_y),
-                lambda param=idx + 1: callback(param),
-                max_width=button_width,
-            )
-            current_y += btn.rect.height + button_margin
+        buttons = question_layout["buttons"]
+        for idx, (lines, x, y, width, _) in enumerate(buttons):
+            if idx < len(self.buttons):
+                btn = self.buttons[idx]
+                btn.option = lines
+                btn.coords = (x, y)
+            else:
+                btn = Button(
+                    self.sprites,
+                    lines,
+                    (x, y),
+                    lambda param=idx + 1: self._answer(param),
+                    max_width=width,
+                )
+                self.buttons.append(btn)
+        for btn in self.buttons[len(buttons):]:
+            btn.kill()
+        del self.buttons[len(buttons):]
+        self._update_clickable()
+
+        # Пока вопрос на экране, готовим следующий
+        self._prefetch(self.current_question_idx + 1)
+
+    def _answer(self, num: int) -> None:
+        """Засчитывает ответ num (с единицы) и показывает следующий экран."""
+        self.session.answer(num - 1)
+        if not self.session.finished:
+            self.make_widjets()
+        else:
+            self._show_stats()
+
+    def _clear(self) -> None:
+        """Убирает все спрайты экрана."""
+        self.sprites.empty()
+        self.counter = None
+        self.question_lines = []
+        self.picture = None
+        self.buttons = []
+
+    def _show_stats(self) -> None:
+        """Заменяет экран вопроса статистикой."""
+        self._clear()
+        text_y = int(self.screen.get_height() * 0.15)
+        text_x = int(self.screen.get_width() * 0.16)
+        text_max_width = int(self.screen.get_width() * 0.76)
+        stats = self.session.stats()
+        text = f"Вы ответили правильно на {stats['percent']}% вопросов. "
+        text += f"Дано правильных ответов - {stats['right']}, "
+        text += f"а неправильных - {stats['wrong']}. "
+        text += f"Всего вопросов {stats['total']}. "
+        self._create_text(text, (text_x, text_y), text_max_width)
+
+        # Кнопка "Вернуться в меню"
+        button_x = int(self.screen.get_width() * 0.6)
+        button_y = int(self.screen.get_height() * 0.8)
+        button_width = int(self.screen.get_width() * 0.38)
+        option = "Вернуться в меню"
+        Button(
+            self.sprites,
+            layout.wrap(option, "button", button_width),
+            (button_x, button_y),
+            self.return_callback,
+            max_width=button_width,
+        )
+        self._update_clickable()
+
+    def _update_clickable(self) -> None:
+        """Передаёт слою кликов кнопки текущего экрана."""
+        self.clickable.rebuild(
+            s for s in self.sprites if isinstance(s, Button) and s.visible
+        )
+
+    def _prefetch(self, idx: int) -> None:
+        """Запускает фоновую подготовку изображения и разметки вопроса idx.
+
+        Ещё не выбранный вопрос адаптивной сессии не трогаем: обращение
+        выбрало бы его до ответа на текущий.
+        """
+        if (
+            idx >= len(self.questions)
+            or idx in self._layouts
+            or not self.session.is_decided(idx)
+        ):
+            return
+        question = self.questions[idx]
+        image_name = question.get("image_name")
+        if image_name and assets.has_image(image_name):
+            image_max_size = int(self.screen.get_height() * 0.27)
+            assets.prefetch_image(image_name, (image_max_size, image_max_size))
+        if question_layouts.get(question, self.screen.get_size()) is None:
+            self._layouts[idx] = assets.submit(self._layout_question, question)
+
+    def _take_layout(self, idx: int) -> dict:
+        """Возвращает разметку вопроса idx, подготовленную заранее или сейчас."""
+        future = self._layouts.pop(idx, None)
+        if future is not None:
+            return future.result()
+        return self._layout_question(self.questions[idx])
+
+    def _layout_question(self, question: dict) -> dict:
+        """Разметка вопроса: скомпилированная при запуске или посчитанная сейчас."""
+        size = self.screen.get_size()
+        compiled = question_layouts.get(question, size)
+        if compiled is not None:
+            return compiled
+        return compute_layout(question, size)
 
     def _create_text(
             self,
@@ -114,65 +212,55 @@ class Quiz:
             max_width: int,
     ) -> None:
         """Создает спрайты Text для каждой строки вопроса."""
-        lines = self.wrap_text(text, cfg.FONT_TEXT, max_width)
+        self._create_lines(layout.wrap(text, "text", max_width), coords)
+
+    def _set_lines(self, pool: list[Text], lines: list[list]) -> None:
+        """Выводит строки [текст, x, y] спрайтами из pool, добавляя и убирая лишние."""
+        for i, (line, x, y) in enumerate(lines):
+            if i < len(pool):
+                pool[i].text = line
+                pool[i].coords = (x, y)
+            else:
+                pool.append(Text(self.sprites, line, (x, y)))
+        for text in pool[len(lines):]:
+            text.kill()
+        del pool[len(lines):]
+
+    def _create_lines(self, lines: list[str], coords: tuple[int, int]) -> None:
+        """Создает спрайты Text для готовых строк."""
         x, y = coords
-        line_height = cfg.FONT_TEXT.get_height()
+        line_height = layout.line_height("text")
         for line in lines:
             Text(self.sprites, line, (x, y))
             y += line_height
 
-    def wrap_text(self, text: str, font: pg.font.Font, max_width: int) -> list[str]:
-        """Разбивает текст на строки, не превышающие max_width."""
-        words = text.split(" ")
-        lines = []
-        current_line = ""
-        for word in words:
-            test_line = current_line + word + " "
-            if font.size(test_line)[0] <= max_width:
-                current_line = test_line
-            elif font.size(word)[0] > max_width:
-                temp_word = ""
-                for char in word:
-                    test_word = temp_word + char + "-"
-                    if font.size(current_line + test_word)[0] <= max_width:
-                        temp_word += char
-                    else:
-                        if current_line:
-                            lines.append(current_line.strip())
-                            current_line = ""
-                        lines.append(temp_word + "-")
-                        temp_word = char
-                current_line = temp_word + " "
-            else:
-                if current_line:
-                    lines.append(current_line.strip())
-                current_line = word + " "
-        if current_line:
-            lines.append(current_line.strip())
-        return lines
-
     def update(self) -> None:
         """Обновление событий."""
 
-    def render(self) -> None:
-        """Отрисовка."""
-        self.sprites.draw(self.screen)
+    def is_animated(self) -> bool:
+        """Нужны ли сцене непрерывные кадры."""
+        return False
+
+    def render(self) -> list[pg.Rect]:
+        """Отрисовка, возвращает изменившиеся области."""
+        return self.sprites.draw(self.screen)
 
     def handle_events(self, events: list[pg.event.Event]) -> None:
         """Реакция на события."""
         for event in events:
-            if event.type == pg.MOUSEBUTTONDOWN and event.button == 1:
-                for sprite in self.sprites:
-                    if isinstance(sprite, Button):
-                        sprite.on_click()
+            self.clickable.handle_event(event)
+
 
+class Button(pg.sprite.DirtySprite):
+    """Класс кнопки.
 
-class Button(pg.sprite.Sprite):
-    """Класс кнопки."""
+    Надпись, положение, цвет и подсветку можно менять: кнопка
+    перерисует только себя и свои надписи.
+    """
 
     def __init__(
         self,
-        group: pg.sprite.Group,
+        group: pg.sprite.LayeredDirty,
         option: list[str],
         coords: tuple[int, int],
         callback: Callable,
@@ -182,63 +270,194 @@ class Button(pg.sprite.Sprite):
         """Кнопка."""
         super().__init__(*groups)
         group.add(self)
-        self.option = option
-        self.coords = coords
+        self._group = group
+        self._option = option
+        self._color = cfg.BUTTON_COLOR
+        self._highlighted = False
         self.callback = callback
         self.max_width = max_width
         self.font = cfg.FONT_BUTTON
-        self.image = self._create_button_surface()
-        self.rect = self.image.get_rect()
-        self.rect.topleft = self.coords
-        pg.mixer.init()
-        self.click = pg.mixer.Sound(cfg.CLICK_PATH)
-
-    def _create_button_surface(self) -> pg.Surface:
-        """Создаёт поверхность кнопки с фоном и текстом."""
+        self.rect = pg.Rect(0, 0, 0, 0)
+        self.rect.topleft = coords
+        self.labels: list[Text] = []
+        self._render()
+
+    @property
+    def option(self) -> list[str]:
+        """Строки надписи."""
+        return self._option
+
+    @option.setter
+    def option(self, option: list[str]) -> None:
+        if option != self._option:
+            self._option = option
+            self._render()
+
+    @property
+    def coords(self) -> tuple[int, int]:
+        """Левый верхний угол."""
+        return self.rect.topleft
+
+    @coords.setter
+    def coords(self, coords: tuple[int, int]) -> None:
+        old = self.rect.topleft
+        self.rect.topleft = coords
+        if self.rect.topleft != old:
+            self.dirty = 1
+            self._place_labels()
+
+    @property
+    def color(self) -> tuple[int, int, int]:
+        """Цвет фона без подсветки."""
+        return self._color
+
+    @color.setter
+    def color(self, color: tuple[int, int, int]) -> None:
+        if color != self._color:
+            self._color = color
+            self._render()
+
+    def _render(self) -> None:
+        """Обновляет фон и надписи после изменения свойств."""
+        color = cfg.BUTTON_HIGHLIGHT_COLOR if self._highlighted else self._color
+        self.image = self._create_button_surface(color)
+        self.rect.size = self.image.get_size()
+        self.dirty = 1
+        self._place_labels()
+
+    def _create_button_surface(
+        self,
+        color: tuple[int, int, int] = cfg.BUTTON_COLOR,
+    ) -> pg.Surface:
+        """Возвращает фон кнопки из атласа; текст рисуют спрайты labels."""
         line_height = self.font.get_height()
-        padding = 10
+        padding = cfg.BUTTON_PADDING
         box_height = line_height * len(self.option) + padding * 2
-        surface = pg.Surface((self.max_width, box_height), pg.SRCALPHA)
-        pg.draw.rect(surface, (230, 230, 230), surface.get_rect(), border_radius=6)
+        return assets.button_background((self.max_width, box_height), color)
+
+    def _place_labels(self) -> None:
+        """Выставляет спрайты строк надписи поверх фона кнопки."""
+        line_height = self.font.get_height()
+        padding = cfg.BUTTON_PADDING
+        x, y = self.rect.topleft
         for i, line in enumerate(self.option):
-            text_surf = self.font.render(line, True, cfg.BLUE)
-            surface.blit(text_surf, (padding, padding + i * line_height))
-        return surface
+            coords = (x + padding, y + padding + i * line_height)
+            if i < len(self.labels):
+                self.labels[i].text = line
+                self.labels[i].coords = coords
+            else:
+                label = Text(
+                    self._group,
+                    line,
+                    coords,
+                    font_name="button",
+                    color=cfg.BLUE,
+                    layer=1,
+                )
+                label.visible = self.visible
+                self.labels.append(label)
+        for label in self.labels[len(self.option):]:
+            label.kill()
+        del self.labels[len(self.option):]
+
+    def _set_visible(self, value: int) -> None:
+        """Скрывает или показывает кнопку вместе с надписями."""
+        super()._set_visible(value)
+        for label in self.labels:
+            label.visible = value
+
+    def kill(self) -> None:
+        """Убирает кнопку вместе с надписями."""
+        for label in self.labels:
+            label.kill()
+        super().kill()
 
     def on_click(self) -> None:
         """Действие на нажатие."""
-        if self.rect.collidepoint(pg.mouse.get_pos()):
-            self.click.play()
-            self.callback()
+        audio.play("click")
+        self.callback()
+
+    def set_highlight(self, highlighted: bool) -> None:
+        """Подсвечивает кнопку при наведении или фокусе."""
+        if highlighted != self._highlighted:
+            self._highlighted = highlighted
+            color = cfg.BUTTON_HIGHLIGHT_COLOR if highlighted else self._color
+            self.image = self._create_button_surface(color)
+            self.dirty = 1
 
 
-class Text(pg.sprite.Sprite):
-    """Выводит данный ему текст."""
+class Text(pg.sprite.DirtySprite):
+    """Выводит данный ему текст; текст, цвет и положение можно менять."""
 
     def __init__(
             self,
-            group: pg.sprite.Group,
+            group: pg.sprite.LayeredDirty,
             text: str,
             coords: tuple[int, int],
             *groups: pg.sprite.AbstractGroup,
+            font_name: str = "text",
+            color: tuple[int, int, int] = cfg.GREEN,
+            layer: int = 0,
     ) -> None:
         """Выводит данный ему текст."""
         super().__init__(*groups)
+        self._layer = layer
         group.add(self)
-        self.text = text
-        self.coords = coords
-        self.font = cfg.FONT_TEXT
-        self.image = self.font.render(text, True, cfg.GREEN)
-        self.rect = self.image.get_rect()
-        self.rect.topleft = self.coords
-
-
-class Image(pg.sprite.Sprite):
-    """Выводит изображение."""
+        self._text = text
+        self._color = color
+        self.font_name = font_name
+        self.font = assets.thread_font(font_name)
+        self.rect = pg.Rect(0, 0, 0, 0)
+        self.rect.topleft = coords
+        self._render()
+
+    @property
+    def text(self) -> str:
+        """Текст надписи."""
+        return self._text
+
+    @text.setter
+    def text(self, text: str) -> None:
+        if text != self._text:
+            self._text = text
+            self._render()
+
+    @property
+    def color(self) -> tuple[int, int, int]:
+        """Цвет надписи."""
+        return self._color
+
+    @color.setter
+    def color(self, color: tuple[int, int, int]) -> None:
+        if color != self._color:
+            self._color = color
+            self._render()
+
+    @property
+    def coords(self) -> tuple[int, int]:
+        """Левый верхний угол."""
+        return self.rect.topleft
+
+    @coords.setter
+    def coords(self, coords: tuple[int, int]) -> None:
+        old = self.rect.topleft
+        self.rect.topleft = coords
+        if self.rect.topleft != old:
+            self.dirty = 1
+
+    def _render(self) -> None:
+        """Заново берёт картинку надписи и помечает спрайт изменённым."""
+        self.image = assets.text(self._text, self.font_name, self._color)
+        self.rect.size = self.image.get_size()
+        self.dirty = 1
+
+
+class Image(pg.sprite.DirtySprite):
+    """Выводит изображение; само изображение и положение можно менять."""
 
     def __init__(
             self,
-            group: pg.sprite.Group,
+            group: pg.sprite.LayeredDirty,
             image_name: str,
             coords: tuple[int, int],
             image_max_size: int,
@@ -247,10 +466,38 @@ class Image(pg.sprite.Sprite):
         """Инициализирует спрайт с изображением из папки media."""
         super().__init__(*groups)
         group.add(self)
-        self.coords = coords
+        self._image_name = image_name
         self.image_max_size = image_max_size
-        image_path = cfg.MEDIA_PATH / image_name
-        self.image = pg.image.load(image_path).convert_alpha()
-        self.image = pg.transform.scale(self.image, (image_max_size, image_max_size))
-        self.rect = self.image.get_rect()
-        self.rect.topleft = self.coords
+        self.rect = pg.Rect(0, 0, 0, 0)
+        self.rect.topleft = coords
+        self._render()
+
+    @property
+    def image_name(self) -> str:
+        """Имя файла изображения в папке media."""
+        return self._image_name
+
+    @image_name.setter
+    def image_name(self, image_name: str) -> None:
+        if image_name != self._image_name:
+            self._image_name = image_name
+            self._render()
+
+    @property
+    def coords(self) -> tuple[int, int]:
+        """Левый верхний угол."""
+        return self.rect.topleft
+
+    @coords.setter
+    def coords(self, coords: tuple[int, int]) -> None:
+        old = self.rect.topleft
+        self.rect.topleft = coords
+        if self.rect.topleft != old:
+            self.dirty = 1
+
+    def _render(self) -> None:
+        """Загружает изображение и помечает спрайт изменённым."""
+        size = (self.image_max_size, self.image_max_size)
+        self.image = assets.image(self._image_name, size)
+        self.rect.size = self.image.get_size()
+        self.dirty = 1
@@ -0,0 +1,74 @@
+"""Модуль сцен: хранит созданные сцены и переключает их без пересоздания."""
+from __future__ import annotations
+
+from typing import Callable, Protocol
+
+import pygame as pg
+
+
+class Scene(Protocol):
+    """То, что App ожидает от сцены."""
+
+    sprites: pg.sprite.LayeredDirty
+
+    def reset(self) -> None:
+        """Возвращает сцену в начальное состояние."""
+
+    def is_animated(self) -> bool:
+        """Нужны ли сцене непрерывные кадры."""
+
+    def update(self) -> None:
+        """Обновление."""
+
+    def render(self) -> list[pg.Rect]:
+        """Отрисовка, возвращает изменившиеся области."""
+
+    def handle_events(self, events: list[pg.event.Event]) -> None:
+        """Реакция на события."""
+
+
+class SceneManager:
+    """Создаёт сцены по требованию и держит их живыми."""
+
+    def __init__(self) -> None:
+        """Менеджер без сцен."""
+        self._factories: dict[str, Callable[[], Scene]] = {}
+        self._scenes: dict[str, Scene] = {}
+        # Сцены, которые prebuild() пропускает
+        self._lazy: set[str] = set()
+
+    def register(
+            self,
+            name: str,
+            factory: Callable[[], Scene],
+            prebuild: bool = True,
+    ) -> None:
+        """Регистрирует способ создать сцену name; без prebuild - только по требованию."""
+        self._factories[name] = factory
+        if prebuild:
+            self._lazy.discard(name)
+        else:
+            self._lazy.add(name)
+
+    def get(self, name: str) -> Scene:
+        """Возвращает сцену name, создавая её при первом обращении."""
+        scene = self._scenes.get(name)
+        if scene is None:
+            scene = self._scenes[name] = self._factories[name]()
+        return scene
+
+    def activate(self, name: str) -> Scene:
+        """Возвращает сцену name, готовую к показу с начала."""
+        scene = self.get(name)
+        scene.reset()
+        return scene
+
+    def discard(self, name: str) -> None:
+        """Забывает сцену name, при следующем обращении она создастся заново."""
+        self._scenes.pop(name, None)
+
+    def prebuild(self) -> None:
+        """Создаёт заранее все зарегистрированные сцены, кроме ленивых."""
+        for name in self._factories:
+            if name not in self._lazy:
+                self.get(name)
@@ -0,0 +1,257 @@
+"""Модуль выбора вопросов: взвешенная выборка и адаптивная сложность.
+
+Вес вопроса растёт с долей ошибок на нём и со временем после
+последнего ответа, показанные вопросы не повторяются, пока не будут
+показаны все вопросы уровня. Выбор вопроса стоит O(log n) благодаря
+дереву Фенвика по весам.
+"""
+from __future__ import annotations
+
+import math
+import random
+import time
+from collections.abc import Callable, Iterable, Sequence
+from typing import TYPE_CHECKING, overload
+
+import config as cfg
+from session import QuizSession
+
+if TYPE_CHECKING:
+    from answer_log import AnswerLog
+
+
+class FenwickTree:
+    """Целые веса с префиксными суммами и поиском по сумме за O(log n)."""
+
+    def __init__(self, weights: Iterable[int]) -> None:
+        """Строит дерево по весам за O(n)."""
+        self._weights = list(weights)
+        self._tree = [0, *self._weights]
+        size = len(self._tree)
+        for i in range(1, size):
+            parent = i + (i & -i)
+            if parent < size:
+                self._tree[parent] += self._tree[i]
+        # Старшая степень двойки, не больше количества весов
+        self._step = 1 << len(self._weights).bit_length() >> 1
+
+    def __len__(self) -> int:
+        """Количество весов."""
+        return len(self._weights)
+
+    def __getitem__(self, idx: int) -> int:
+        """Вес idx."""
+        return self._weights[idx]
+
+    def __setitem__(self, idx: int, weight: int) -> None:
+        """Меняет вес idx."""
+        delta = weight - self._weights[idx]
+        self._weights[idx] = weight
+        i = idx + 1
+        while i < len(self._tree):
+            self._tree[i] += delta
+            i += i & -i
+
+    def prefix(self, end: int) -> int:
+        """Сумма весов с индексами меньше end."""
+        total = 0
+        while end > 0:
+            total += self._tree[end]
+            end -= end & -end
+        return total
+
+    @property
+    def total(self) -> int:
+        """Сумма всех весов."""
+        return self.prefix(len(self._weights))
+
+    def find(self, value: int) -> int:
+        """Наименьший индекс, на котором префиксная сумма превышает value."""
+        idx = 0
+        step = self._step
+        while step:
+            nxt = idx + step
+            if nxt < len(self._tree) and self._tree[nxt] <= value:
+                idx = nxt
+                value -= self._tree[nxt]
+            step >>= 1
+        return idx
+
+
+class QuestionSelector:
+    """Взвешенный выбор вопросов из банков по уровням сложности.
+
+    Показанные вопросы помнятся между сессиями: вопрос вернётся, только
+    когда будут показаны все остальные вопросы его уровня. После
+    перезапуска текущий круг восстанавливается по истории ответов.
+    """
+
+    def __init__(
+            self,
+            banks: dict[str, Sequence[dict]],
+            history: dict[tuple[str, int], dict[str, float]] | None = None,
+            rng: random.Random | None = None,
+            clock: Callable[[], float] = time.time,
+    ) -> None:
+        """Выбор из banks; history - итоги answer_log.aggregate для начальных весов.
+
+        clock - текущее время unix, как в журнале ответов.
+        """
+        self.banks = banks
+        self.levels = list(banks)
+        self.rng = rng or random.Random()
+        self.clock = clock
+        # (уровень, вопрос) -> [ответов, ошибок]
+        self._answers: dict[tuple[str, int], list[int]] = {}
+        # (уровень, вопрос) -> время последнего ответа
+        self._last: dict[tuple[str, int], float] = {}
+        for key, totals in (history or {}).items():
+            if key[0] in banks and 0 <= key[1] < len(banks[key[0]]):
+                answers = int(totals["answers"])
+                wrong = answers - round(totals["accuracy"] * answers)
+                self._answers[key] = [answers, wrong]
+                self._last[key] = totals.get("last_answered", 0.0)
+        self._seen: dict[str, set[int]] = {level: set() for level in self.levels}
+        self._replay_rounds()
+        self._trees = {level: self._build(level) for level in self.levels}
+
+    def _replay_rounds(self) -> None:
+        """Восстанавливает показанные в текущем круге вопросы по порядку ответов."""
+        for (level, idx), _ in sorted(self._last.items(), key=lambda item: item[1]):
+            seen = self._seen[level]
+            if len(seen) >= len(self.banks[level]):
+                seen.clear()
+            seen.add(idx)
+
+    def weight(self, level: str, idx: int) -> int:
+        """Вес ещё не показанного вопроса: чем чаще на нём ошибаются, тем больше.
+
+        Без истории вопрос считается отвеченным верно наполовину. Только
+        что отвеченный вопрос весит вдвое меньше, давно отвеченный - полностью.
+        """
+        answers, wrong = self._answers.get((level, idx), (0, 0))
+        share = (wrong + 1) / (answers + 2)
+        last = self._last.get((level, idx))
+        if last is not None:
+            age = max(0.0, self.clock() - last)
+            share *= 1 - 0.5 * math.exp(-age / cfg.SELECTION_RECENCY)
+        return max(1, round(cfg.SELECTION_WEIGHT_SCALE * share))
+
+    def _build(self, level: str) -> FenwickTree:
+        """Дерево весов уровня, где у показанных вопросов вес 0."""
+        seen = self._seen[level]
+        return FenwickTree(
+            0 if idx in seen else self.weight(level, idx)
+            for idx in range(len(self.banks[level]))
+        )
+
+    def draw(self, level: str) -> int:
+        """Выбирает вопрос уровня с вероятностью, пропорциональной весу."""
+        tree = self._trees[level]
+        if not tree.total:
+            # Показаны все вопросы уровня: начинаем новый круг
+            self._seen[level].clear()
+            tree = self._trees[level] = self._build(level)
+        idx = tree.find(self.rng.randrange(tree.total))
+        tree[idx] = 0
+        self._seen[level].add(idx)
+        return idx
+
+    def record(self, level: str, idx: int, correct: bool) -> None:
+        """Учитывает ответ; новый вес вступит в силу в следующем круге."""
+        totals = self._answers.setdefault((level, idx), [0, 0])
+        totals[0] += 1
+        totals[1] += not correct
+        self._last[level, idx] = self.clock()
+
+
+class AdaptiveQuestions(Sequence):
+    """Вопросы адаптивной сессии, выбираемые при первом обращении."""
+
+    def __init__(self, session: AdaptiveSession, length: int) -> None:
+        """Последовательность из length вопросов для session."""
+        self.session = session
+        self.length = length
+        # (уровень, номер в банке) выбранных вопросов
+        self.picks: list[tuple[str, int]] = []
+
+    def __len__(self) -> int:
+        """Количество вопросов."""
+        return self.length
+
+    @overload
+    def __getitem__(self, idx: int) -> dict: ...
+
+    @overload
+    def __getitem__(self, idx: slice) -> list[dict]: ...
+
+    def __getitem__(self, idx: int | slice) -> dict | list[dict]:
+        """Вопрос idx; ещё не выбранные вопросы берутся с текущего уровня."""
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(self.length))]
+        if idx < 0:
+            idx += self.length
+        if not 0 <= idx < self.length:
+            raise IndexError(idx)
+        level, bank_idx = self.ensure_picked(idx)
+        return self.session.selector.banks[level][bank_idx]
+
+    def ensure_picked(self, idx: int) -> tuple[str, int]:
+        """Выбирает вопросы до idx включительно, возвращает уровень и номер idx."""
+        selector = self.session.selector
+        while len(self.picks) <= idx:
+            level = self.session.level_name
+            self.picks.append((level, selector.draw(level)))
+        return self.picks[idx]
+
+
+class AdaptiveSession(QuizSession):
+    """Сессия, где уровень следующих вопросов зависит от ответов.
+
+    Верный ответ поднимает уровень на cfg.ADAPTIVE_STEP, ошибка опускает.
+    Следующий вопрос выбирается только после ответа на текущий, поэтому
+    Quiz не готовит его заранее (см. is_decided).
+    """
+
+    def __init__(
+            self,
+            selector: QuestionSelector,
+            length: int = cfg.ADAPTIVE_QUIZ_LENGTH,
+            log: AnswerLog | None = None,
+    ) -> None:
+        """Сессия из length вопросов, выбираемых selector."""
+        self.selector = selector
+        self.level = 0.0
+        super().__init__(AdaptiveQuestions(self, length), "adaptive", log)
+
+    @property
+    def level_name(self) -> str:
+        """Уровень, с которого берутся следующие вопросы.
+
+        Половины округляются вверх: round() округлял бы 0.5 и 1.5 в разные стороны.
+        """
+        return self.selector.levels[math.floor(self.level + 0.5)]
+
+    def is_decided(self, idx: int) -> bool:
+        """Выбран ли уже вопрос idx; обращение к невыбранному выберет его."""
+        return idx < len(self.questions.picks)
+
+    def log_key(self) -> tuple[str, int]:
+        """Уровень и номер текущего вопроса в его банке."""
+        return self.questions.ensure_picked(self.current_question_idx)
+
+    def answer(self, option_idx: int) -> bool:
+        """Засчитывает ответ и сдвигает уровень."""
+        level, bank_idx = self.log_key()
+        correct = super().answer(option_idx)
+        self.selector.record(level, bank_idx, correct)
+        step = cfg.ADAPTIVE_STEP if correct else -cfg.ADAPTIVE_STEP
+        top = len(self.selector.levels) - 1
+        self.level = min(max(self.level + step, 0.0), float(top))
+        return correct
+
+    def reset(self) -> None:
+        """Начинает заново с новыми вопросами с нижнего уровня."""
+        self.level = 0.0
+        self.questions.picks.clear()
+        super().reset()
@@ -0,0 +1,253 @@
+"""Модуль сервера: много сессий викторины в одном asyncio-процессе.
+
+Протокол - JSON по строке на сообщение. Запросы:
+    {"op": "difficulties"}
+    {"op": "start", "difficulty": "easy"}
+    {"op": "question", "session": id, "idx": 0}
+    {"op": "answer", "session": id, "option": 2}
+    {"op": "reset", "session": id}
+    {"op": "close", "session": id}
+Правильный ответ (answer_idx) клиенту не отправляется, ответы
+проверяет сервер. Запуск:
+    python server.py [--host 0.0.0.0] [--port 8765]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import secrets
+from collections.abc import Sequence
+from typing import Any
+
+import config as cfg
+from answer_log import AnswerLog
+from question_bank import load_banks
+from session import QuizSession
+
+
+class ProtocolError(Exception):
+    """Неверный запрос клиента."""
+
+
+class SessionEngine:
+    """Хранит сессии и отвечает на запросы, не обращаясь к сети."""
+
+    def __init__(
+            self,
+            banks: dict[str, Sequence[dict]],
+            log: AnswerLog | None = None,
+    ) -> None:
+        """Движок с банками вопросов banks; ответы пишутся в log, если он задан."""
+        self.banks = banks
+        self.log = log
+        self.sessions: dict[str, QuizSession] = {}
+
+    def handle(self, request: dict[str, Any]) -> dict[str, Any]:
+        """Ответ на запрос; ошибки возвращаются как {"error": ...}."""
+        try:
+            handler = getattr(self, f"_op_{request.get('op')}", None)
+            if handler is None:
+                raise ProtocolError(f"неизвестная операция {request.get('op')!r}")
+            return handler(request)
+        except ProtocolError as error:
+            return {"error": str(error)}
+
+    def _session(self, request: dict[str, Any]) -> QuizSession:
+        """Сессия из запроса."""
+        session_id = request.get("session")
+        session = self.sessions.get(session_id) if isinstance(session_id, str) else None
+        if session is None:
+            raise ProtocolError("нет такой сессии")
+        return session
+
+    def _op_difficulties(self, request: dict[str, Any]) -> dict[str, Any]:
+        """Список сложностей."""
+        return {"difficulties": list(self.banks)}
+
+    def _op_start(self, request: dict[str, Any]) -> dict[str, Any]:
+        """Новая сессия и её первый вопрос."""
+        difficulty = request.get("difficulty")
+        questions = self.banks.get(difficulty) if isinstance(difficulty, str) else None
+        if questions is None:
+            raise ProtocolError("нет такой сложности")
+        session_id = secrets.token_hex(8)
+        session = self.sessions[session_id] = QuizSession(
+            questions, difficulty, self.log,
+        )
+        return {"session": session_id, **self._state(session)}
+
+    def _op_question(self, request: dict[str, Any]) -> dict[str, Any]:
+        """Вопрос с номером idx, без правильного ответа."""
+        session = self._session(request)
+        idx = request.get("idx")
+        if (
+            not isinstance(idx, int)
+            or isinstance(idx, bool)
+            or not 0 <= idx < len(session.questions)
+        ):
+            raise ProtocolError("нет такого вопроса")
+        return {"question": public_question(session.questions[idx])}
+
+    def _op_answer(self, request: dict[str, Any]) -> dict[str, Any]:
+        """Засчитывает ответ и возвращает новое состояние сессии."""
+        session = self._session(request)
+        option = request.get("option")
+        if session.finished:
+            raise ProtocolError("викторина уже закончена")
+        if not isinstance(option, int) or isinstance(option, bool):
+            raise ProtocolError("option должен быть числом")
+        if not 0 <= option < len(session.question["options"]):
+            raise ProtocolError("нет такого варианта")
+        correct = session.answer(option)
+        return {"correct": correct, **self._state(session)}
+
+    def _op_reset(self, request: dict[str, Any]) -> dict[str, Any]:
+        """Начинает сессию заново."""
+        session = self._session(request)
+        session.reset()
+        return self._state(session)
+
+    def _op_close(self, request: dict[str, Any]) -> dict[str, Any]:
+        """Удаляет сессию."""
+        session_id = request.get("session")
+        if isinstance(session_id, str):
+            self.sessions.pop(session_id, None)
+        return {}
+
+    def _state(self, session: QuizSession) -> dict[str, Any]:
+        """Состояние сессии для клиента."""
+        state = {
+            "idx": session.current_question_idx,
+            "finished": session.finished,
+            **session.stats(),
+        }
+        if not session.finished:
+            state["question"] = public_question(session.question)
+        return state
+
+
+def public_question(question: dict) -> dict:
+    """Вопрос без правильного ответа."""
+    return {key: value for key, value in question.items() if key != "answer_idx"}
+
+
+class LocalTransport:
+    """Подключение к движку в том же процессе, для тестов и нагрузочных прогонов.
+
+    Сообщения проходят через JSON, как по сети, и каждый запрос
+    отдаёт управление циклу событий.
+    """
+
+    def __init__(self, engine: SessionEngine) -> None:
+        """Подключение к engine."""
+        self.engine = engine
+        self.sessions: set[str] = set()
+
+    async def request(self, message: dict[str, Any]) -> dict[str, Any]:
+        """Отправляет запрос и ждёт ответ."""
+        await asyncio.sleep(0)
+        response = self.engine.handle(json.loads(json.dumps(message)))
+        _track_sessions(self.sessions, message, response)
+        return json.loads(json.dumps(response))
+
+    async def close(self) -> None:
+        """Закрывает сессии подключения."""
+        for session_id in self.sessions:
+            self.engine.sessions.pop(session_id, None)
+        self.sessions.clear()
+
+
+class TcpTransport:
+    """Подключение к серверу по TCP."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Подключение поверх открытого потока."""
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def connect(cls, host: str, port: int) -> TcpTransport:
+        """Открывает подключение к host:port."""
+        reader, writer = await asyncio.open_connection(
+            host, port, limit=cfg.SERVER_LINE_LIMIT,
+        )
+        return cls(reader, writer)
+
+    async def request(self, message: dict[str, Any]) -> dict[str, Any]:
+        """Отправляет запрос и ждёт ответ."""
+        self.writer.write(json.dumps(message, ensure_ascii=False).encode() + b"\n")
+        await self.writer.drain()
+        line = await self.reader.readline()
+        if not line:
+            raise ConnectionError("сервер закрыл соединение")
+        return json.loads(line)
+
+    async def close(self) -> None:
+        """Закрывает подключение."""
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+def _track_sessions(sessions: set[str], request: dict, response: dict) -> None:
+    """Запоминает сессии подключения, чтобы закрыть их вместе с ним."""
+    if request.get("op") == "start" and "session" in response:
+        sessions.add(response["session"])
+    elif request.get("op") == "close" and isinstance(request.get("session"), str):
+        sessions.discard(request["session"])
+
+
+async def serve(engine: SessionEngine, host: str, port: int) -> asyncio.Server:
+    """Запускает TCP-сервер движка engine."""
+    async def handle_client(
+            reader: asyncio.StreamReader,
+            writer: asyncio.StreamWriter,
+    ) -> None:
+        sessions: set[str] = set()
+        try:
+            while line := await reader.readline():
+                try:
+                    request = json.loads(line)
+                except json.JSONDecodeError:
+                    request = None
+                if isinstance(request, dict):
+                    response = engine.handle(request)
+                    _track_sessions(sessions, request, response)
+                else:
+                    response = {"error": "ожидался JSON-объект"}
+                writer.write(json.dumps(response, ensure_ascii=False).encode() + b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            for session_id in sessions:
+                engine.sessions.pop(session_id, None)
+            writer.close()
+
+    return await asyncio.start_server(
+        handle_client, host, port, limit=cfg.SERVER_LINE_LIMIT,
+    )
+
+
+async def _main(host: str, port: int) -> None:
+    """Сервер с банками из question_bank.load_banks()."""
+    log = AnswerLog(cfg.ANSWER_LOG_PATH) if cfg.ANSWER_LOG_ENABLED else None
+    server = await serve(SessionEngine(load_banks(), log), host, port)
+    print(f"Сервер викторины слушает {host}:{port}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        if log is not None:
+            log.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Сервер викторины")
+    parser.add_argument("--host", default=cfg.SERVER_HOST)
+    parser.add_argument("--port", type=int, default=cfg.SERVER_PORT)
+    args = parser.parse_args()
+    try:
+        asyncio.run(_main(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
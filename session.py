@@ -0,0 +1,101 @@
+"""Модуль сессии: ход викторины без отрисовки.
+
+Сессию использует сцена Quiz, а сервер (server.py) держит их тысячами.
+"""
+from __future__ import annotations
+
+import time
+from collections.abc import Sequence
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from answer_log import AnswerLog
+
+
+class QuizSession:
+    """Одно прохождение викторины: текущий вопрос, проверка ответов, счётчики."""
+
+    def __init__(
+            self,
+            questions: Sequence[dict],
+            difficulty: str = "",
+            log: AnswerLog | None = None,
+    ) -> None:
+        """Сессия с первого вопроса; ответы пишутся в log, если он задан."""
+        self.questions = questions
+        self.difficulty = difficulty
+        self.log = log
+        self.current_question_idx = 0
+        self.right_answer_counter = 0
+        self.wrong_answer_counter = 0
+        self.finished = False
+        self.shown_at = time.perf_counter()
+
+    def mark_shown(self) -> None:
+        """Отмечает, что текущий вопрос показан; от этого считается задержка ответа."""
+        self.shown_at = time.perf_counter()
+
+    @property
+    def question(self) -> dict:
+        """Текущий вопрос."""
+        return self.questions[self.current_question_idx]
+
+    @property
+    def started(self) -> bool:
+        """Был ли дан хотя бы один ответ."""
+        return bool(self.right_answer_counter or self.wrong_answer_counter)
+
+    def is_decided(self, idx: int) -> bool:
+        """Известен ли уже вопрос idx; его можно готовить заранее."""
+        return True
+
+    def log_key(self) -> tuple[str, int]:
+        """Сложность и номер, под которыми текущий вопрос пишется в журнал."""
+        return self.difficulty, self.current_question_idx
+
+    def answer(self, option_idx: int) -> bool:
+        """Засчитывает ответ на текущий вопрос и переходит к следующему.
+
+        Возвращает, был ли ответ правильным.
+        """
+        if self.finished:
+            raise ValueError("Викторина уже закончена")
+        correct = option_idx == self.question["answer_idx"]
+        if self.log is not None:
+            # Запись упаковывается до изменения счётчиков: ошибка не портит сессию
+            difficulty, question_idx = self.log_key()
+            self.log.record(
+                difficulty,
+                question_idx,
+                option_idx,
+                correct,
+                time.perf_counter() - self.shown_at,
+            )
+        if correct:
+            self.right_answer_counter += 1
+        else:
+            self.wrong_answer_counter += 1
+        if self.current_question_idx + 1 < len(self.questions):
+            self.current_question_idx += 1
+        else:
+            self.finished = True
+        self.mark_shown()
+        return correct
+
+    def reset(self) -> None:
+        """Начинает заново с первого вопроса."""
+        self.current_question_idx = 0
+        self.right_answer_counter = 0
+        self.wrong_answer_counter = 0
+        self.finished = False
+        self.mark_shown()
+
+    def stats(self) -> dict[str, int]:
+        """Итоги: правильные, неправильные, всего вопросов и процент правильных."""
+        total = len(self.questions)
+        return {
+            "right": self.right_answer_counter,
+            "wrong": self.wrong_answer_counter,
+            "total": total,
+            "percent": round(self.right_answer_counter / total * 100) if total else 0,
+        }
@@ -0,0 +1,64 @@
+"""Тесты журнала ответов."""
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from answer_log import AnswerLog, aggregate
+
+
+class AnswerLogTest(unittest.TestCase):
+    """Запись в журнал и подсчёт статистики."""
+
+    def setUp(self) -> None:
+        """Журнал во временной папке."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "answers.log"
+
+    def tearDown(self) -> None:
+        """Удаляет временную папку."""
+        self.tmp.cleanup()
+
+    def test_aggregate(self) -> None:
+        log = AnswerLog(self.path)
+        log.record("easy", 3, 1, True, 2.0)
+        log.record("easy", 3, 0, False, 4.0)
+        log.record("medium", 0, 2, True, 1.0)
+        log.close()
+        totals = aggregate(self.path)
+        self.assertEqual(sorted(totals), [("easy", 3), ("medium", 0)])
+        self.assertEqual(totals["easy", 3]["answers"], 2)
+        self.assertEqual(totals["easy", 3]["accuracy"], 0.5)
+        self.assertEqual(totals["easy", 3]["mean_latency"], 3.0)
+
+    def test_two_writers_share_difficulty_ids(self) -> None:
+        # Сложности впервые встречаются в разном порядке
+        first = AnswerLog(self.path)
+        second = AnswerLog(self.path)
+        second.record("hard", 0, 0, False, 1.0)
+        first.record("easy", 0, 1, True, 1.0)
+        second.close()
+        first.close()
+        totals = aggregate(self.path)
+        self.assertEqual(totals["easy", 0]["accuracy"], 1.0)
+        self.assertEqual(totals["hard", 0]["accuracy"], 0.0)
+
+    def test_unknown_difficulty(self) -> None:
+        log = AnswerLog(self.path)
+        with self.assertRaises(ValueError):
+            log.record("unknown", 0, 0, True, 1.0)
+        log.close()
+
+    def test_write_error_stops_log(self) -> None:
+        # Вместо файла журнала - папка: открыть её на запись нельзя
+        self.path.mkdir()
+        log = AnswerLog(self.path)
+        log._thread.join()
+        self.assertIsInstance(log.error, OSError)
+        log.record("easy", 0, 0, True, 1.0)
+        log.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
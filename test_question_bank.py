@@ -0,0 +1,54 @@
+"""Тесты скомпилированного банка вопросов."""
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from question_bank import QuestionBank, compile_bank, load_banks, source_hash
+
+BANKS = {
+    name: [{"text": f"{name}?", "options": ["да", "нет"], "answer_idx": 1}]
+    for name in ("easy", "medium", "hard")
+}
+
+
+class LoadBanksTest(unittest.TestCase):
+    """База используется, только если собрана из текущего источника."""
+
+    def setUp(self) -> None:
+        """Источник и база во временной папке."""
+        self.tmp = tempfile.TemporaryDirectory()
+        folder = Path(self.tmp.name)
+        self.source = folder / "questions.py"
+        self.source.write_text("easy = []\n", "utf-8")
+        self.db = folder / "questions.db"
+
+    def tearDown(self) -> None:
+        """Удаляет временную папку."""
+        self.tmp.cleanup()
+
+    def test_fresh_database_is_used(self) -> None:
+        compile_bank(BANKS, self.db, source_hash(self.source))
+        banks = load_banks(self.db, self.source)
+        self.assertIsInstance(banks["easy"], QuestionBank)
+        self.assertEqual(banks["medium"][0]["text"], "medium?")
+
+    def test_stale_database_is_skipped(self) -> None:
+        compile_bank(BANKS, self.db, source_hash(self.source))
+        self.source.write_text("easy = [1]\n", "utf-8")
+        banks = load_banks(self.db, self.source)
+        self.assertNotIsInstance(banks["easy"], QuestionBank)
+
+    def test_database_without_hash_is_skipped(self) -> None:
+        compile_bank(BANKS, self.db)
+        self.assertNotIsInstance(load_banks(self.db, self.source)["easy"], QuestionBank)
+
+    def test_database_without_source_is_used(self) -> None:
+        compile_bank(BANKS, self.db)
+        self.source.unlink()
+        self.assertIsInstance(load_banks(self.db, self.source)["easy"], QuestionBank)
+
+
+if __name__ == "__main__":
+    unittest.main()
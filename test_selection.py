@@ -0,0 +1,119 @@
+"""Тесты дерева Фенвика и выбора вопросов."""
+from __future__ import annotations
+
+import bisect
+import itertools
+import random
+import unittest
+
+import config as cfg
+from selection import FenwickTree, QuestionSelector
+
+
+def question(n: int) -> dict:
+    """Вопрос-заглушка номер n."""
+    return {"text": f"Вопрос {n}", "options": ["да", "нет"], "answer_idx": 0}
+
+
+class FenwickTreeTest(unittest.TestCase):
+    """Префиксные суммы и поиск по сумме против прямого подсчёта."""
+
+    def test_find_matches_linear_search(self) -> None:
+        rng = random.Random(1)
+        for size in (1, 2, 3, 7, 8, 9, 100):
+            weights = [rng.choice((0, 1, 5, 10)) for _ in range(size)]
+            weights[rng.randrange(size)] = 3
+            tree = FenwickTree(weights)
+            sums = list(itertools.accumulate(weights))
+            self.assertEqual(tree.total, sums[-1])
+            for value in range(tree.total):
+                self.assertEqual(tree.find(value), bisect.bisect_right(sums, value))
+
+    def test_update_changes_prefix_and_find(self) -> None:
+        tree = FenwickTree([1, 1, 1, 1, 1])
+        tree[2] = 0
+        self.assertEqual(tree.prefix(3), 2)
+        self.assertEqual(tree.total, 4)
+        self.assertEqual([tree.find(v) for v in range(4)], [0, 1, 3, 4])
+        tree[4] = 6
+        self.assertEqual([tree.find(3), tree.find(8)], [4, 4])
+        self.assertEqual(tree[4], 6)
+
+
+class QuestionSelectorTest(unittest.TestCase):
+    """Круги без повторов и веса вопросов."""
+
+    def setUp(self) -> None:
+        """Банки из 5 и 3 вопросов, время стоит на месте."""
+        self.banks = {
+            "easy": [question(n) for n in range(5)],
+            "hard": [question(n) for n in range(3)],
+        }
+        self.now = 1_000_000.0
+
+    def selector(self, history: dict | None = None, seed: int = 0) -> QuestionSelector:
+        """Выбор с фиксированными генератором и временем."""
+        return QuestionSelector(
+            self.banks, history, random.Random(seed), clock=lambda: self.now,
+        )
+
+    def test_no_repeats_within_round(self) -> None:
+        for seed in range(20):
+            selector = self.selector(seed=seed)
+            draws = [selector.draw("easy") for _ in range(15)]
+            for start in range(0, 15, 5):
+                self.assertEqual(sorted(draws[start:start + 5]), list(range(5)))
+
+    def test_levels_are_independent(self) -> None:
+        selector = self.selector()
+        easy = [selector.draw("easy") for _ in range(4)]
+        hard = [selector.draw("hard") for _ in range(3)]
+        self.assertEqual(sorted(hard), [0, 1, 2])
+        self.assertNotIn(selector.draw("easy"), easy)
+
+    def test_wrong_answers_weigh_more(self) -> None:
+        selector = self.selector()
+        selector.record("easy", 0, correct=False)
+        selector.record("easy", 1, correct=True)
+        # Давние ответы: поправка на недавность не влияет
+        self.now += 30 * cfg.SELECTION_RECENCY
+        self.assertGreater(selector.weight("easy", 0), selector.weight("easy", 2))
+        self.assertLess(selector.weight("easy", 1), selector.weight("easy", 2))
+
+    def test_recent_answers_weigh_less(self) -> None:
+        history = {
+            ("easy", 0): {"answers": 2, "accuracy": 0.5, "last_answered": self.now},
+            ("easy", 1): {
+                "answers": 2,
+                "accuracy": 0.5,
+                "last_answered": self.now - 30 * cfg.SELECTION_RECENCY,
+            },
+        }
+        selector = self.selector(history)
+        self.assertEqual(selector.weight("easy", 1), selector.weight("easy", 2))
+        self.assertAlmostEqual(
+            selector.weight("easy", 0), selector.weight("easy", 2) / 2, delta=1,
+        )
+
+    def test_round_survives_restart(self) -> None:
+        # В прошлом запуске показаны вопросы 3, 1 и 4 из 5
+        history = {
+            ("easy", idx): {"answers": 1, "accuracy": 1.0, "last_answered": at}
+            for idx, at in ((3, 10.0), (1, 20.0), (4, 30.0))
+        }
+        for seed in range(10):
+            selector = self.selector(history, seed)
+            self.assertEqual(sorted(selector.draw("easy") for _ in range(2)), [0, 2])
+
+    def test_replay_starts_new_round_when_level_is_exhausted(self) -> None:
+        # Круг 0, 1, 2 закончен, новый начат с вопроса 0
+        history = {
+            ("hard", idx): {"answers": 1, "accuracy": 1.0, "last_answered": at}
+            for idx, at in ((1, 1.0), (2, 2.0), (0, 3.0))
+        }
+        selector = self.selector(history)
+        self.assertEqual(sorted(selector.draw("hard") for _ in range(2)), [1, 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+"""Тесты протокола сервера через LocalTransport."""
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from answer_log import AnswerLog, aggregate
+from server import LocalTransport, SessionEngine
+
+BANKS = {
+    "easy": [
+        {"text": "Первый?", "options": ["да", "нет"], "answer_idx": 0},
+        {"text": "Второй?", "options": ["а", "б", "в"], "answer_idx": 2},
+    ],
+}
+
+
+class ProtocolTest(unittest.IsolatedAsyncioTestCase):
+    """Запросы start/question/answer/close и неверные запросы."""
+
+    async def asyncSetUp(self) -> None:
+        """Движок с маленьким банком и журналом во временной папке."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.log_path = Path(self.tmp.name) / "answers.log"
+        self.log = AnswerLog(self.log_path)
+        self.engine = SessionEngine(BANKS, self.log)
+        self.client = LocalTransport(self.engine)
+
+    async def asyncTearDown(self) -> None:
+        """Закрывает журнал и удаляет временную папку."""
+        await self.client.close()
+        self.log.close()
+        self.tmp.cleanup()
+
+    async def start(self) -> dict:
+        """Новая сессия на лёгкой сложности."""
+        return await self.client.request({"op": "start", "difficulty": "easy"})
+
+    async def test_start_hides_answer(self) -> None:
+        state = await self.start()
+        self.assertEqual(state["idx"], 0)
+        self.assertFalse(state["finished"])
+        self.assertEqual(state["question"]["text"], "Первый?")
+        self.assertNotIn("answer_idx", state["question"])
+
+    async def test_answers_until_finished(self) -> None:
+        session = (await self.start())["session"]
+        first = await self.client.request({"op": "answer", "session": session, "option": 0})
+        self.assertTrue(first["correct"])
+        self.assertEqual(first["idx"], 1)
+        last = await self.client.request({"op": "answer", "session": session, "option": 0})
+        self.assertFalse(last["correct"])
+        self.assertTrue(last["finished"])
+        self.assertNotIn("question", last)
+        self.assertEqual((last["right"], last["wrong"], last["percent"]), (1, 1, 50))
+        after = await self.client.request({"op": "answer", "session": session, "option": 0})
+        self.assertIn("error", after)
+        self.log.close()
+        self.assertEqual(aggregate(self.log_path)["easy", 1]["accuracy"], 0.0)
+
+    async def test_question_by_idx(self) -> None:
+        session = (await self.start())["session"]
+        response = await self.client.request({"op": "question", "session": session, "idx": 1})
+        self.assertEqual(response["question"]["options"], ["а", "б", "в"])
+        for idx in (2, -1, True, "0"):
+            response = await self.client.request(
+                {"op": "question", "session": session, "idx": idx},
+            )
+            self.assertIn("error", response)
+
+    async def test_bad_option_keeps_session(self) -> None:
+        session = (await self.start())["session"]
+        for option in (-1, 2, 300, True, "0", None):
+            response = await self.client.request(
+                {"op": "answer", "session": session, "option": option},
+            )
+            self.assertIn("error", response)
+        state = await self.client.request({"op": "answer", "session": session, "option": 0})
+        self.assertEqual((state["idx"], state["right"], state["wrong"]), (1, 1, 0))
+
+    async def test_bad_fields_are_errors(self) -> None:
+        requests = [
+            {"op": "nope"},
+            {"op": "start", "difficulty": "unknown"},
+            {"op": "start", "difficulty": ["x"]},
+            {"op": "answer", "session": [1], "option": 0},
+            {"op": "question", "session": {"a": 1}, "idx": 0},
+            {"op": "reset", "session": "missing"},
+        ]
+        for request in requests:
+            self.assertIn("error", await self.client.request(request))
+        self.assertEqual(await self.client.request({"op": "close", "session": [1]}), {})
+
+    async def test_close_removes_session(self) -> None:
+        session = (await self.start())["session"]
+        await self.client.request({"op": "close", "session": session})
+        self.assertNotIn(session, self.engine.sessions)
+        response = await self.client.request({"op": "reset", "session": session})
+        self.assertIn("error", response)
+
+
+if __name__ == "__main__":
+    unittest.main()
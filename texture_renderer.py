@@ -0,0 +1,116 @@
+"""Модуль отрисовки через SDL2 Renderer: спрайты и фон - кэшированные текстуры.
+
+Выбирается при запуске (cfg.RENDER_BACKEND = "texture" или
+python main.py --texture). Работает и с программным рендерером SDL,
+без видеокарты. Кадр собирается целиком из текстур: картинки спрайтов
+загружаются в текстуры один раз, страницы атласа - по одной текстуре
+на страницу, а надписи и изображения, общие для спрайтов, - по одной
+текстуре на поверхность.
+"""
+from __future__ import annotations
+
+import weakref
+from collections.abc import Iterable
+
+import pygame as pg
+from pygame._sdl2 import video
+
+import config as cfg
+from assets import assets
+
+
+class TextureRenderer:
+    """Окно с SDL2 Renderer и кэш текстур для поверхностей спрайтов."""
+
+    def __init__(self, size: tuple[int, int], flags: int = 0) -> None:
+        """Открывает окно size; (0, 0) - во весь экран, как у set_mode."""
+        fullscreen = size == (0, 0)
+        if fullscreen:
+            size = pg.display.get_desktop_sizes()[0]
+        # convert() и convert_alpha() нужен режим дисплея: скрытое окно 1x1
+        pg.display.set_mode((1, 1), pg.HIDDEN)
+        self.window = video.Window(
+            pg.display.get_caption()[0] or "pygame",
+            size=size,
+            resizable=bool(flags & pg.RESIZABLE),
+            fullscreen_desktop=fullscreen,
+        )
+        self.renderer = video.Renderer(self.window, accelerated=-1)
+        # Сцены рисуют и меряют по этой поверхности, на экран она не выводится
+        self.screen = pg.Surface(size)
+        self._textures: weakref.WeakKeyDictionary[pg.Surface, video.Texture] = (
+            weakref.WeakKeyDictionary()
+        )
+        # Текстуры страниц атласа и AtlasPage.placed на момент загрузки
+        self._pages: weakref.WeakKeyDictionary[
+            pg.Surface, tuple[video.Texture, int]
+        ] = weakref.WeakKeyDictionary()
+        self.uploads = 0
+
+    def resize(self) -> pg.Surface:
+        """Подгоняет поверхность сцен под новый размер окна."""
+        self.screen = pg.Surface(self.window.size)
+        return self.screen
+
+    def texture(self, surface: pg.Surface) -> video.Texture:
+        """Текстура поверхности, загружается при первом обращении."""
+        texture = self._textures.get(surface)
+        if texture is None:
+            texture = self._textures[surface] = video.Texture.from_surface(
+                self.renderer, surface,
+            )
+            self.uploads += 1
+        return texture
+
+    def _sync_atlas(self) -> None:
+        """Перезагружает страницы атласа, на которые что-то добавили.
+
+        Области заполняются сразу после выдачи, до следующего кадра.
+        """
+        for page in assets.atlas.pages:
+            cached = self._pages.get(page.surface)
+            if cached is None:
+                texture = video.Texture.from_surface(self.renderer, page.surface)
+            elif cached[1] != page.placed:
+                texture = cached[0]
+                texture.update(page.surface)
+            else:
+                continue
+            self.uploads += 1
+            self._pages[page.surface] = (texture, page.placed)
+
+    def draw(
+            self,
+            background: pg.Surface,
+            sprites: pg.sprite.LayeredDirty,
+            overlays: Iterable[tuple[pg.Surface, pg.Rect]] = (),
+    ) -> None:
+        """Собирает и показывает кадр: фон, видимые спрайты, затем overlays.
+
+        overlays меняются каждый кадр, поэтому их текстуры не кэшируются.
+        """
+        self._sync_atlas()
+        renderer = self.renderer
+        renderer.draw_color = (*cfg.BLACK, 255)
+        renderer.clear()
+        renderer.blit(self.texture(background), background.get_rect())
+        for sprite in sprites.sprites():
+            if not sprite.visible:
+                continue
+            image = sprite.image
+            parent = image.get_parent()
+            page = self._pages.get(parent) if parent is not None else None
+            if page is not None:
+                # Область атласа рисуем прямо из текстуры страницы
+                area = pg.Rect(image.get_offset(), image.get_size())
+                renderer.blit(page[0], sprite.rect, area)
+            else:
+                renderer.blit(self.texture(image), sprite.rect)
+        for surface, rect in overlays:
+            renderer.blit(video.Texture.from_surface(renderer, surface), rect)
+        renderer.present()
+
+    def clear(self) -> None:
+        """Забывает текстуры."""
+        self._textures.clear()
+        self._pages.clear()